@@ -2,6 +2,16 @@
 
 __version__ = "0.1.0"
 
-from claude_sync.sync import SyncOrchestrator
+__all__ = ["SyncOrchestrator"]
 
-__all__ = ["SyncOrchestrator"]
\ No newline at end of file
+
+def __getattr__(name: str):
+    """Import SyncOrchestrator on first use.
+    
+    Importing it pulls in Playwright and psutil, which the extractors and
+    models don't need.
+    """
+    if name == "SyncOrchestrator":
+        from claude_sync.sync import SyncOrchestrator
+        return SyncOrchestrator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,6 +1,12 @@
 """Browser management for Claude Sync."""
 from .config import BrowserConfig
 from .connection import ChromeConnection
-from .manager import ChromeManager
+from .manager import ChromeManager, get_shared_connection, shutdown_shared_connection
 
-__all__ = ["BrowserConfig", "ChromeManager", "ChromeConnection"]
\ No newline at end of file
+__all__ = [
+    "BrowserConfig",
+    "ChromeManager",
+    "ChromeConnection",
+    "get_shared_connection",
+    "shutdown_shared_connection",
+]
\ No newline at end of file
@@ -32,6 +32,11 @@ class BrowserConfig(BaseModel):
         default=720,
         description="Browser viewport height"
     )
+    max_concurrent_downloads: int = Field(
+        default=4,
+        ge=1,
+        description="Maximum knowledge files downloaded in parallel per project"
+    )
     
     def get_chrome_args(self) -> List[str]:
         """Get Chrome launch arguments for memory optimization and stability."""
@@ -1,28 +1,301 @@
 """Type-safe Chrome connection wrapper."""
+import asyncio
 import logging
-from pathlib import Path
-from typing import List, Optional
+import re
+import time
+from typing import Any, Dict, List, Literal, Optional, Tuple
 
-import aiofiles
-from playwright.async_api import BrowserContext, Page, Download
+from playwright.async_api import BrowserContext, CDPSession, Page, Response
 
 from claude_sync.extractors import ProjectExtractor, KnowledgeExtractor
+from claude_sync.extractors.knowledge import KNOWLEDGE_FILES_JS
+from claude_sync.extractors.projects import PROJECT_CARDS_JS
 from claude_sync.models import Project, KnowledgeFile
 
 logger = logging.getLogger(__name__)
 
+# claude.ai API responses listing projects, and a single project's docs
+PROJECTS_API_RE = re.compile(r"/api/organizations/[^/]+/projects/?(?:\?|$)")
+PROJECT_DOCS_API_RE = re.compile(r"/api/organizations/[^/]+/projects/([^/?]+)/docs/?(?:\?|$)")
+
+# Seconds a captured API payload is trusted over the rendered page
+API_CACHE_TTL = 30.0
+
+# Milliseconds navigate() waits for the projects or project docs API,
+# counted from the start of navigation to the page
+PROJECTS_API_TIMEOUT_MS = 5000
+
+# Seconds the download pool stops opening extra pages after one fails to load
+POOL_GROW_BACKOFF = 30.0
+
+# URLs of images, fonts and media, which none of the scrapers read. Chrome
+# blocks them itself (CDP Network.setBlockedURLs), so other requests never
+# detour through Python and the HTTP cache stays on, unlike with page.route.
+BLOCKED_URL_PATTERNS = (
+    "*.png",
+    "*.jpg",
+    "*.jpeg",
+    "*.gif",
+    "*.webp",
+    "*.avif",
+    "*.ico",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*.otf",
+    "*.mp4",
+    "*.webm",
+    "*.mp3",
+)
+
+PROJECT_LINK_SELECTOR = 'a[href*="/project/"]'
+
+# True once more project links are rendered than the given count
+MORE_PROJECT_LINKS_JS = """
+(count) => document.querySelectorAll('a[href*="/project/"]').length > count
+"""
+
+THUMBNAIL_SELECTOR = 'div[data-testid="file-thumbnail"]'
+
+# True once the knowledge panel has finished rendering: every file the docs
+# API listed has a thumbnail or, when the API was not seen, any thumbnail or
+# the empty-project message is shown
+KNOWLEDGE_READY_JS = """
+(expected) => {
+    const count = document.querySelectorAll('div[data-testid="file-thumbnail"]').length;
+    if (expected !== null) return count >= expected;
+    return count > 0 || /No files added yet/i.test(document.body?.innerText ?? '');
+}
+"""
+
+# Names of all file thumbnails in page order, so a file can be located by
+# index without a query per thumbnail
+THUMBNAIL_NAMES_JS = """
+() => Array.from(document.querySelectorAll('div[data-testid="file-thumbnail"]')).map(
+    thumb => thumb.querySelector('h3')?.textContent?.trim() ?? null
+)
+"""
+
+# Click the button of the thumbnail whose name matches, in one round trip.
+# Returns whether a button was clicked.
+CLICK_THUMBNAIL_JS = """
+(name) => {
+    for (const thumb of document.querySelectorAll('div[data-testid="file-thumbnail"]')) {
+        const h3 = thumb.querySelector('h3');
+        if (h3 && h3.textContent.trim() === name) {
+            const button = thumb.querySelector('button');
+            if (button) {
+                button.click();
+                return true;
+            }
+        }
+    }
+    return false;
+}
+"""
+
+# URL paths only reachable when logged in
+LOGGED_IN_PATHS = ("/project", "/chat", "/new", "/recents")
+
+# Containers holding the project list and the knowledge panel; the HTML
+# fallbacks serialize only these instead of the whole document
+PROJECTS_CONTAINER_SELECTOR = '[data-testid="projects-list"], main'
+KNOWLEDGE_CONTAINER_SELECTOR = '[data-testid="knowledge-files"], main'
+
+# outerHTML of the first element matching a selector, or null
+SCOPED_HTML_JS = """
+(selector) => document.querySelector(selector)?.outerHTML ?? null
+"""
+
+# Common modal close buttons, tried in order: (kind, selector or label)
+CLOSE_TARGETS = (
+    ('selector', 'button[aria-label*="close" i]'),
+    ('text', 'Close'),
+    ('text', '×'),
+    ('text', 'X'),
+    ('selector', '[class*="close"]'),
+)
+
+# Anything treated as an open dialog, by both the open check and close
+DIALOG_SELECTOR = '[role="dialog"], [aria-modal="true"]'
+
+# Clicks the first visible close button matching the given targets, in
+# order, and reports whether one was found (null if no dialog is open).
+# Text targets match a button's trimmed text exactly.
+CLOSE_MODAL_JS = """
+({dialogSelector, targets}) => {
+    // Nothing to close
+    if (!document.querySelector(dialogSelector)) return null;
+    const isVisible = el => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const buttons = Array.from(document.querySelectorAll('button'));
+    for (const [kind, value] of targets) {
+        const el = kind === 'text'
+            ? buttons.find(b => b.textContent.trim() === value && isVisible(b))
+            : Array.from(document.querySelectorAll(value)).find(isVisible);
+        if (el) {
+            el.click();
+            return true;
+        }
+    }
+    return false;
+}
+"""
+
+# Whether any dialog is open, as a single in-page check
+MODAL_OPEN_JS = """
+(dialogSelector) => !!document.querySelector(dialogSelector)
+"""
+
+# Escape presses tried on a dialog without a close button, and milliseconds
+# to wait for it to close after each
+ESCAPE_ATTEMPTS = 3
+ESCAPE_WAIT_MS = 500
+
+# Milliseconds to wait for file content to render after opening a file modal
+MODAL_CONTENT_TIMEOUT_MS = 3000
+
+# Upper bound on characters returned by the modal content fallbacks
+MAX_FALLBACK_CONTENT_CHARS = 1_000_000
+
+# Resolves as soon as substantial content appears in the file modal, so the
+# wait and the extraction share a single evaluate round-trip. On timeout it
+# falls back to the longest text in the modal, then the longest text block
+# on the page.
+MODAL_CONTENT_JS = """
+({ timeoutMs, maxFallbackLength }) => new Promise(resolve => {
+    // The actual content is usually in a monospace font div; one selector
+    // list is matched in a single pass, in document order
+    const contentSelector = [
+        'div[class*="font-mono"]',
+        'div[class*="whitespace-pre-wrap"]',
+        'pre',
+        'code',
+    ].join(', ');
+    
+    const findContent = () => {
+        const modal = document.querySelector('[role="dialog"]');
+        if (!modal) return null;
+        
+        for (const el of modal.querySelectorAll(contentSelector)) {
+            const text = el.textContent?.trim() || '';
+            // Skip metadata lines
+            if (text.includes('KB') && text.includes('lines') && text.length < 100) continue;
+            if (text.includes('Formatting may be') && text.length < 100) continue;
+            
+            // If it's substantial content, return it
+            if (text.length > 100) {
+                return {
+                    content: text,
+                    selector: el.tagName.toLowerCase(),
+                    className: el.className
+                };
+            }
+        }
+        return null;
+    };
+    
+    // Fallback guesses can be the text of the whole page, so cap what is
+    // sent back over the connection
+    const capped = (text, selector) => ({
+        content: text.slice(0, maxFallbackLength),
+        selector: selector,
+        truncated: text.length > maxFallbackLength,
+    });
+    
+    const findFallback = () => {
+        // Longest text in the modal
+        const modal = document.querySelector('[role="dialog"]');
+        if (modal) {
+            let longestText = '';
+            for (const el of modal.querySelectorAll('*')) {
+                const text = el.textContent?.trim() || '';
+                if (text.length > longestText.length &&
+                    !text.includes('KB') &&
+                    !text.includes('Formatting may be')) {
+                    longestText = text;
+                }
+            }
+            if (longestText) return capped(longestText, 'fallback');
+        }
+        
+        // Sometimes content appears in the main view: take the longest
+        // text block, staying inside the dialog when there is one
+        const walker = document.createTreeWalker(
+            modal || document.body,
+            NodeFilter.SHOW_TEXT,
+            {
+                acceptNode: function(node) {
+                    // Skip script and style tags
+                    const parent = node.parentElement;
+                    if (parent.tagName === 'SCRIPT' || parent.tagName === 'STYLE') {
+                        return NodeFilter.FILTER_REJECT;
+                    }
+                    return NodeFilter.FILTER_ACCEPT;
+                }
+            },
+            false
+        );
+        
+        let longest = '';
+        let node;
+        while (node = walker.nextNode()) {
+            const text = node.textContent.trim();
+            if (text.length > longest.length) {
+                longest = text;
+            }
+        }
+        
+        return longest.length > 100 ? capped(longest, 'text') : null;
+    };
+    
+    const found = findContent();
+    if (found) {
+        resolve(found);
+        return;
+    }
+    
+    let timer = null;
+    const observer = new MutationObserver(() => {
+        const content = findContent();
+        if (content) {
+            observer.disconnect();
+            clearTimeout(timer);
+            resolve(content);
+        }
+    });
+    observer.observe(document.body, { subtree: true, childList: true, characterData: true });
+    timer = setTimeout(() => {
+        observer.disconnect();
+        resolve(findContent() || findFallback());
+    }, timeoutMs);
+})
+"""
+
 
 class ChromeConnection:
     """Type-safe wrapper for Chrome browser operations."""
     
-    def __init__(self, context: BrowserContext) -> None:
+    def __init__(self, context: BrowserContext, page_pool_size: int = 4) -> None:
         """Initialize connection with browser context.
         
         Args:
             context: Playwright browser context
+            page_pool_size: Maximum number of pages used for concurrent downloads
         """
         self.context = context
+        self.page_pool_size = page_pool_size
         self._current_page: Optional[Page] = None
+        # Whether _current_page was opened by us rather than found in the context
+        self._owns_current_page = False
+        self._idle_pages: Optional[asyncio.Queue] = None
+        self._extra_pages: List[Page] = []
+        self._pool_count = 0
+        self._pool_grow_after = 0.0
+        self._hooked_pages: List[Page] = []
+        self._blocking_sessions: List[CDPSession] = []
+        self._api_cache: Dict[str, Tuple[float, Any]] = {}
+        self._project_extractor = ProjectExtractor()
+        self._knowledge_extractor = KnowledgeExtractor()
     
     async def get_or_create_page(self) -> Page:
         """Get current page or create new one.
@@ -37,22 +310,127 @@ class ChromeConnection:
         pages = self.context.pages
         if pages:
             self._current_page = pages[0]
+            self._owns_current_page = False
         else:
             self._current_page = await self.context.new_page()
+            self._owns_current_page = True
         
+        await self._install_page_hooks(self._current_page)
         return self._current_page
     
-    async def navigate(self, url: str, timeout: int = 60000) -> None:
-        """Navigate to URL and wait for page to load.
+    async def _install_page_hooks(self, page: Page) -> None:
+        """Install the resource filter and API capture on a page we drive.
+        
+        Hooks go on our own pages rather than the context, so other tabs in
+        a Chrome we attached to are left alone.
+        
+        Args:
+            page: Page to hook (hooked at most once)
+        """
+        if page in self._hooked_pages:
+            return
+        
+        self._hooked_pages.append(page)
+        page.on("response", self._capture_api_response)
+        try:
+            session = await self.context.new_cdp_session(page)
+            await session.send("Network.enable")
+            await session.send("Network.setBlockedURLs", {"urls": list(BLOCKED_URL_PATTERNS)})
+            self._blocking_sessions.append(session)
+        except Exception as e:
+            logger.debug(f"Could not install resource filter: {e}")
+    
+    async def _remove_page_hooks(self) -> None:
+        """Remove the resource filter and API capture from every hooked page."""
+        for page in self._hooked_pages:
+            if not page.is_closed():
+                page.remove_listener("response", self._capture_api_response)
+        self._hooked_pages = []
+        
+        for session in self._blocking_sessions:
+            try:
+                await session.send("Network.setBlockedURLs", {"urls": []})
+                await session.detach()
+            except Exception as e:
+                logger.debug(f"Could not remove resource filter: {e}")
+        self._blocking_sessions = []
+    
+    async def _capture_api_response(self, response: Response) -> None:
+        """Keep claude.ai projects and docs API payloads for the extractors."""
+        docs_match = PROJECT_DOCS_API_RE.search(response.url)
+        if not docs_match and not PROJECTS_API_RE.search(response.url):
+            return
+        
+        try:
+            payload = await response.json()
+        except Exception as e:
+            logger.debug(f"Could not read API response {response.url}: {e}")
+            return
+        
+        if not isinstance(payload, list):
+            return
+        
+        now = time.monotonic()
+        if docs_match:
+            self._api_cache[f"docs:{docs_match.group(1)}"] = (now, payload)
+            return
+        
+        # The project list may arrive in pages; merge them by uuid
+        known = self._get_api_payload("projects") or []
+        merged = {record.get('uuid'): record for record in known + payload}
+        self._api_cache["projects"] = (now, list(merged.values()))
+    
+    def _get_api_payload(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Get a captured API payload if it is recent enough to trust."""
+        entry = self._api_cache.get(key)
+        if entry is None or time.monotonic() - entry[0] > API_CACHE_TTL:
+            return None
+        return entry[1]
+    
+    async def navigate(
+        self,
+        url: str,
+        timeout: int = 15000,
+        wait_until: Literal["commit", "domcontentloaded", "load", "networkidle"] = "commit"
+    ) -> None:
+        """Navigate to URL.
+        
+        By default this returns once the server response is committed;
+        callers wait for the elements or API responses they actually need.
         
         Args:
             url: URL to navigate to
-            timeout: Navigation timeout in milliseconds (default: 60s)
+            timeout: Navigation timeout in milliseconds (default: 15s)
+            wait_until: Playwright load state that ends the navigation
         """
         page = await self.get_or_create_page()
         logger.info(f"Navigating to: {url}")
-        await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
-        self._current_page = page
+        
+        if url.rstrip('/').endswith("/projects"):
+            api_re = PROJECTS_API_RE
+        elif "/project/" in url:
+            api_re = PROJECT_DOCS_API_RE
+        else:
+            await page.goto(url, wait_until=wait_until, timeout=timeout)
+            self._current_page = page
+            return
+        
+        # The project list and a project's docs arrive as JSON well before
+        # the cards render, so listen for them while the page loads
+        loaded = False
+        try:
+            async with page.expect_response(
+                lambda response: bool(api_re.search(response.url)),
+                timeout=PROJECTS_API_TIMEOUT_MS,
+            ) as response_info:
+                await page.goto(url, wait_until=wait_until, timeout=timeout)
+                loaded = True
+                self._current_page = page
+            await self._capture_api_response(await response_info.value)
+        except Exception as e:
+            if not loaded:
+                raise
+            logger.debug(f"API response not seen for {url}: {e}")
     
     async def get_page_content(self) -> str:
         """Get current page HTML content.
@@ -63,6 +441,26 @@ class ChromeConnection:
         page = await self.get_or_create_page()
         return await page.content()
     
+    async def get_scoped_html(self, selector: str) -> str:
+        """Get HTML of the first element matching a selector.
+        
+        Falls back to the full page HTML if nothing matches.
+        
+        Args:
+            selector: CSS selector of the container to serialize
+            
+        Returns:
+            HTML content
+        """
+        page = await self.get_or_create_page()
+        try:
+            html = await page.evaluate(SCOPED_HTML_JS, selector)
+            if isinstance(html, str):
+                return html
+        except Exception as e:
+            logger.debug(f"Scoped HTML lookup failed for {selector}: {e}")
+        return await page.content()
+    
     async def wait_for_selector(
         self, 
         selector: str, 
@@ -85,6 +483,27 @@ class ChromeConnection:
             logger.warning(f"Selector '{selector}' not found: {e}")
             return None
     
+    async def wait_for_knowledge_files(self, timeout: int = 8000) -> None:
+        """Wait for the current project's knowledge panel to finish rendering.
+        
+        When the docs API was captured during navigation, this waits for a
+        thumbnail per listed file, so empty projects return at once; without
+        it, for a first thumbnail or the empty-project message.
+        
+        Args:
+            timeout: Timeout in milliseconds
+        """
+        page = await self.get_or_create_page()
+        project_id = page.url.partition('/project/')[2].split('?')[0]
+        docs = self._get_api_payload(f"docs:{project_id}") if project_id else None
+        expected = len(docs) if docs is not None else None
+        
+        try:
+            await page.wait_for_function(KNOWLEDGE_READY_JS, arg=expected, timeout=timeout)
+        except Exception as e:
+            # Not fatal: extraction works on whatever has rendered
+            logger.debug(f"Knowledge files not rendered on {page.url}: {e}")
+    
     async def is_logged_in(self) -> bool:
         """Check if user is logged into Claude.
         
@@ -94,15 +513,23 @@ class ChromeConnection:
         page = await self.get_or_create_page()
         
         # Check if we're on a logged-in page
-        if "/project" in page.url or "/chat" in page.url:
+        if any(path in page.url for path in LOGGED_IN_PATHS):
             return True
         
         # Navigate to Claude and check
         if page.url != "https://claude.ai":
-            await self.navigate("https://claude.ai")
+            # The login button check below needs the DOM, not just the response
+            await self.navigate("https://claude.ai", wait_until="domcontentloaded")
+        
+        # Server-side redirects to login are visible as soon as navigation ends
+        if "login" in page.url:
+            return False
         
-        # Wait a bit for redirect
-        await page.wait_for_timeout(2000)
+        # Wait for the page to finish loading so any login redirect has happened
+        try:
+            await page.wait_for_load_state("load", timeout=3000)
+        except Exception as e:
+            logger.debug(f"Page did not finish loading: {e}")
         
         # Check for login indicators
         if "login" in page.url:
@@ -125,24 +552,58 @@ class ChromeConnection:
         # Check if we're on the projects page
         if "/projects" not in page.url:
             logger.warning(f"Not on projects page: {page.url}")
-            html = await self.get_page_content()
-            extractor = ProjectExtractor()
-            return extractor.extract_from_html(html)
+            return await self._extract_project_cards(page)
         
         # Look for "View All" button and click it if present
         try:
             view_all_button = await page.query_selector("button:has-text('View all')")
             if view_all_button and await view_all_button.is_visible():
                 logger.info("Found 'View all' button, clicking to load all projects")
+                shown = await page.locator(PROJECT_LINK_SELECTOR).count()
                 await view_all_button.click()
-                # Wait for projects to load
-                await page.wait_for_timeout(2000)
+                # Wait until more project cards than before are rendered
+                try:
+                    await page.wait_for_function(
+                        MORE_PROJECT_LINKS_JS, arg=shown, timeout=3000
+                    )
+                except Exception as e:
+                    logger.debug(f"No additional projects appeared: {e}")
         except Exception as e:
             logger.debug(f"No 'View all' button found or error clicking: {e}")
         
+        # Prefer the project list the app fetched from its API
+        records = self._get_api_payload("projects")
+        if records:
+            projects = self._project_extractor.extract_from_api(records)
+            if projects:
+                logger.debug(f"Using {len(projects)} projects from the projects API")
+                return projects
+        
         # Extract projects
-        html = await self.get_page_content()
-        extractor = ProjectExtractor()
+        return await self._extract_project_cards(page)
+    
+    async def _extract_project_cards(self, page: Page) -> List[Project]:
+        """Extract project cards with a single in-page projection.
+        
+        Falls back to serializing and parsing the list container's HTML
+        if the projection cannot be evaluated.
+        
+        Args:
+            page: Page showing the projects list
+            
+        Returns:
+            List of projects
+        """
+        extractor = self._project_extractor
+        
+        try:
+            records = await page.evaluate(PROJECT_CARDS_JS)
+            if isinstance(records, list):
+                return extractor.extract_from_records(records)
+        except Exception as e:
+            logger.debug(f"Project card projection failed: {e}")
+        
+        html = await self.get_scoped_html(PROJECTS_CONTAINER_SELECTOR)
         return extractor.extract_from_html(html)
     
     async def extract_knowledge_files(self) -> List[KnowledgeFile]:
@@ -151,190 +612,263 @@ class ChromeConnection:
         Returns:
             List of knowledge files
         """
-        html = await self.get_page_content()
-        extractor = KnowledgeExtractor()
-        return extractor.extract_from_html(html)
+        page = await self.get_or_create_page()
+        extractor = self._knowledge_extractor
+        
+        # Project only the thumbnail fields; the full HTML is needed only
+        # for the legacy layouts handled by the soup strategies
+        files = None
+        try:
+            records = await page.evaluate(KNOWLEDGE_FILES_JS)
+            if isinstance(records, list):
+                files = extractor.extract_from_records(records)
+        except Exception as e:
+            logger.debug(f"Knowledge file projection failed: {e}")
+        
+        if files is None:
+            html = await self.get_scoped_html(KNOWLEDGE_CONTAINER_SELECTOR)
+            files = extractor.extract_from_html(html)
+        
+        # Fill in content the app already fetched from the docs API
+        project_id = page.url.partition('/project/')[2].split('?')[0]
+        docs = self._get_api_payload(f"docs:{project_id}") if project_id else None
+        if docs:
+            files = extractor.attach_api_content(files, docs)
+        
+        return files
     
     async def download_file_content(self, file_name: str) -> Optional[str]:
         """Download content of a knowledge file by clicking and extracting from modal.
         
+        Safe to call concurrently: each call runs on its own page from the
+        download pool.
+        
         Args:
             file_name: Name of file to download
             
         Returns:
             File content or None if failed
         """
-        page = await self.get_or_create_page()
+        try:
+            page = await self.acquire_page()
+        except Exception as e:
+            logger.error(f"No page available to download '{file_name}': {e}")
+            return None
+        
+        try:
+            return await self._download_from_page(page, file_name)
+        finally:
+            self.release_page(page)
+    
+    async def acquire_page(self) -> Page:
+        """Take a page showing the current project from the download pool.
+        
+        The first page in the pool is the current page. While every pooled
+        page is busy, extra pages are opened on the current URL up to
+        page_pool_size; after that, callers wait for a page to be released.
+        If an extra page fails to load, the pool stops growing for
+        POOL_GROW_BACKOFF seconds; an idle page that fails to load the
+        current URL is dropped from the pool the same way.
+        
+        Returns:
+            Page instance, to be handed back with release_page
+        """
+        current = await self.get_or_create_page()
+        idle = self._get_idle_pages()
+        
+        while True:
+            if (
+                idle.empty()
+                and self._pool_count < self.page_pool_size
+                and time.monotonic() >= self._pool_grow_after
+            ):
+                self._pool_count += 1
+                if self._pool_count == 1:
+                    return current
+                
+                page = await self.context.new_page()
+                try:
+                    await self._install_page_hooks(page)
+                    await self._show_current_project(page, current)
+                    self._extra_pages.append(page)
+                    return page
+                except Exception as e:
+                    logger.warning(f"Could not open extra download page: {e}")
+                    await page.close()
+                    # Back off from growing the pool and wait for a page that works
+                    self._pool_count -= 1
+                    self._pool_grow_after = time.monotonic() + POOL_GROW_BACKOFF
+            
+            page = await idle.get()
+            if page is current or page.url == current.url:
+                return page
+            
+            try:
+                await self._show_current_project(page, current)
+                return page
+            except Exception as e:
+                logger.warning(f"Could not reuse download page: {e}")
+                await self._drop_pool_page(page)
+    
+    async def _drop_pool_page(self, page: Page) -> None:
+        """Remove a broken page from the download pool, closing it if we opened it."""
+        self._pool_count -= 1
+        self._pool_grow_after = time.monotonic() + POOL_GROW_BACKOFF
+        if page in self._extra_pages:
+            self._extra_pages.remove(page)
+            try:
+                await page.close()
+            except Exception as e:
+                logger.debug(f"Could not close download page: {e}")
+    
+    def release_page(self, page: Page) -> None:
+        """Return a page taken with acquire_page to the download pool.
         
+        Args:
+            page: Page to return
+        """
+        self._get_idle_pages().put_nowait(page)
+    
+    def _get_idle_pages(self) -> asyncio.Queue:
+        """Get the queue of idle pool pages, creating it on first use."""
+        if self._idle_pages is None:
+            self._idle_pages = asyncio.Queue()
+        return self._idle_pages
+    
+    async def _show_current_project(self, page: Page, current: Page) -> None:
+        """Point a pool page at the current page's URL and wait for its files."""
+        await page.goto(current.url, wait_until="domcontentloaded")
+        await page.wait_for_selector(THUMBNAIL_SELECTOR)
+    
+    async def _download_from_page(self, page: Page, file_name: str) -> Optional[str]:
+        """Download a knowledge file by opening its modal on the given page.
+        
+        Args:
+            page: Page showing the project's knowledge files
+            file_name: Name of file to download
+            
+        Returns:
+            File content or None if failed
+        """
         try:
-            # Find the file thumbnail by name
-            thumbnails = await page.query_selector_all('div[data-testid="file-thumbnail"]')
+            # Find the file thumbnail by name in a single round-trip
+            names = await page.evaluate(THUMBNAIL_NAMES_JS)
+            if not isinstance(names, list) or file_name not in names:
+                logger.error(f"File '{file_name}' not found on page")
+                return None
             
-            for thumb in thumbnails:
-                # Check if this is our file
-                h3 = await thumb.query_selector('h3')
-                if h3:
-                    name = await h3.text_content()
-                    if name and name.strip() == file_name:
-                        # Click the thumbnail to open the modal
-                        button = await thumb.query_selector('button')
-                        if button:
-                            logger.info(f"Clicking on file: {file_name}")
-                            await button.click()
-                            
-                            # Wait for modal to appear
-                            await page.wait_for_timeout(1000)
-                            
-                            # Strategy 1: Look for modal/dialog content
-                            # Wait a bit for modal to fully render
-                            await page.wait_for_timeout(1500)
-                            
-                            # Use JavaScript to find the actual content more reliably
-                            content_data = await page.evaluate('''
-                                () => {
-                                    // Find the modal
-                                    const modal = document.querySelector('[role="dialog"]');
-                                    if (!modal) return null;
-                                    
-                                    // Look for the main content div - it has specific styling
-                                    // The actual content is usually in a monospace font div
-                                    const contentSelectors = [
-                                        'div[class*="font-mono"]',
-                                        'div[class*="whitespace-pre-wrap"]',
-                                        'pre',
-                                        'code',
-                                    ];
-                                    
-                                    for (const selector of contentSelectors) {
-                                        const elements = modal.querySelectorAll(selector);
-                                        for (const el of elements) {
-                                            const text = el.textContent?.trim() || '';
-                                            // Skip metadata lines
-                                            if (text.includes('KB') && text.includes('lines') && text.length < 100) continue;
-                                            if (text.includes('Formatting may be') && text.length < 100) continue;
-                                            
-                                            // If it's substantial content, return it
-                                            if (text.length > 100) {
-                                                return {
-                                                    content: text,
-                                                    selector: selector,
-                                                    className: el.className
-                                                };
-                                            }
-                                        }
-                                    }
-                                    
-                                    // Fallback: get the longest text in the modal
-                                    let longestText = '';
-                                    const allElements = modal.querySelectorAll('*');
-                                    for (const el of allElements) {
-                                        const text = el.textContent?.trim() || '';
-                                        if (text.length > longestText.length && 
-                                            !text.includes('KB') && 
-                                            !text.includes('Formatting may be')) {
-                                            longestText = text;
-                                        }
-                                    }
-                                    
-                                    return longestText ? { content: longestText, selector: 'fallback' } : null;
-                                }
-                            ''')
-                            
-                            if content_data and content_data.get('content'):
-                                logger.info(f"Found content via {content_data.get('selector', 'unknown')} ({len(content_data['content'])} chars)")
-                                
-                                # Close modal
-                                await self._close_modal(page)
-                                
-                                return content_data['content'].strip()
-                            
-                            # Strategy 2: If no modal found, try getting all text from page
-                            # Sometimes content appears in the main view
-                            await page.wait_for_timeout(1000)
-                            
-                            # Get the full page text and look for file content
-                            # This is less precise but can work as a fallback
-                            all_text = await page.evaluate('''
-                                () => {
-                                    // Get all text content from the page
-                                    const walker = document.createTreeWalker(
-                                        document.body,
-                                        NodeFilter.SHOW_TEXT,
-                                        {
-                                            acceptNode: function(node) {
-                                                // Skip script and style tags
-                                                const parent = node.parentElement;
-                                                if (parent.tagName === 'SCRIPT' || parent.tagName === 'STYLE') {
-                                                    return NodeFilter.FILTER_REJECT;
-                                                }
-                                                return NodeFilter.FILTER_ACCEPT;
-                                            }
-                                        },
-                                        false
-                                    );
-                                    
-                                    const texts = [];
-                                    let node;
-                                    while (node = walker.nextNode()) {
-                                        const text = node.textContent.trim();
-                                        if (text.length > 50) {  // Skip short texts
-                                            texts.push(text);
-                                        }
-                                    }
-                                    
-                                    // Return the longest text block (likely the file content)
-                                    return texts.sort((a, b) => b.length - a.length)[0] || '';
-                                }
-                            ''')
-                            
-                            if all_text and len(all_text) > 100:
-                                logger.info(f"Found content via text extraction ({len(all_text)} chars)")
-                                await self._close_modal(page)
-                                return all_text
-                            
-                            # If still no content, log what we see for debugging
-                            logger.warning(f"Could not find content for {file_name} after clicking")
-                            
-                            # Try to close any modal
-                            await self._close_modal(page)
-                            
-                            return None
+            # Click the thumbnail to open the modal
+            button = page.locator(THUMBNAIL_SELECTOR).nth(names.index(file_name)).locator('button')
+            logger.info(f"Clicking on file: {file_name}")
+            await button.first.click()
+            
+            # Wait for the modal content and extract it in one round-trip
+            content_data = await page.evaluate(
+                MODAL_CONTENT_JS,
+                {
+                    "timeoutMs": MODAL_CONTENT_TIMEOUT_MS,
+                    "maxFallbackLength": MAX_FALLBACK_CONTENT_CHARS,
+                },
+            )
+            
+            if content_data and content_data.get('content'):
+                logger.info(f"Found content via {content_data.get('selector', 'unknown')} ({len(content_data['content'])} chars)")
+                if content_data.get('truncated'):
+                    logger.warning(f"Fallback content for {file_name} truncated to {MAX_FALLBACK_CONTENT_CHARS} chars")
+                
+                # Close modal
+                await self._close_modal(page)
+                
+                return content_data['content'].strip()
+            
+            # If still no content, log what we see for debugging
+            logger.warning(f"Could not find content for {file_name} after clicking")
+            
+            # Try to close any modal
+            await self._close_modal(page)
             
-            logger.error(f"File '{file_name}' not found on page")
             return None
             
         except Exception as e:
             logger.error(f"Failed to download file '{file_name}': {e}")
             return None
     
+    async def is_modal_open(self, page: Optional[Page] = None) -> bool:
+        """Check whether a dialog is open.
+        
+        Args:
+            page: Page to check (defaults to the current page)
+            
+        Returns:
+            True if a dialog is open
+        """
+        if page is None:
+            page = await self.get_or_create_page()
+        return bool(await page.evaluate(MODAL_OPEN_JS, DIALOG_SELECTOR))
+    
+    async def close_modal(self, page: Optional[Page] = None) -> None:
+        """Close any dialog open on a page.
+        
+        Args:
+            page: Page to clean up (defaults to the current page)
+        """
+        if page is None:
+            page = await self.get_or_create_page()
+        await self._close_modal(page)
+    
     async def _close_modal(self, page: Page) -> None:
         """Try to close any open modal."""
         try:
-            # Common close button selectors
-            close_selectors = [
-                'button[aria-label*="close" i]',
-                'button[aria-label*="Close" i]',
-                'button:has-text("Close")',
-                'button:has-text("×")',
-                'button:has-text("X")',
-                '[class*="close"]',
-            ]
+            closed = await page.evaluate(
+                CLOSE_MODAL_JS,
+                {"dialogSelector": DIALOG_SELECTOR, "targets": CLOSE_TARGETS},
+            )
+            if closed is None:
+                return
+            if closed:
+                # Let the dialog go away before the next file is opened
+                await page.wait_for_selector(DIALOG_SELECTOR, state="detached", timeout=2000)
+                return
             
-            for selector in close_selectors:
-                close_btn = await page.query_selector(selector)
-                if close_btn and await close_btn.is_visible():
-                    await close_btn.click()
-                    await page.wait_for_timeout(500)
+            # If no close button found, press Escape only while the dialog
+            # is still open
+            for _ in range(ESCAPE_ATTEMPTS):
+                await page.keyboard.press('Escape')
+                try:
+                    await page.wait_for_selector(
+                        DIALOG_SELECTOR, state="detached", timeout=ESCAPE_WAIT_MS
+                    )
                     return
+                except Exception:
+                    if not await self.is_modal_open(page):
+                        return
             
-            # If no close button found, try pressing Escape
-            await page.keyboard.press('Escape')
+            logger.debug("Modal still open after pressing Escape")
             
         except Exception as e:
             logger.debug(f"Error closing modal: {e}")
     
     async def close(self) -> None:
-        """Close current page."""
-        if self._current_page and not self._current_page.is_closed():
+        """Close the pages this connection opened.
+        
+        A current page found in the context, such as a tab of a Chrome we
+        attached to, belongs to the user and is left open.
+        """
+        await self._remove_page_hooks()
+        
+        for page in self._extra_pages:
+            if not page.is_closed():
+                await page.close()
+        self._extra_pages = []
+        self._idle_pages = None
+        self._pool_count = 0
+        self._pool_grow_after = 0.0
+        
+        if (
+            self._owns_current_page
+            and self._current_page
+            and not self._current_page.is_closed()
+        ):
             await self._current_page.close()
-            self._current_page = None
\ No newline at end of file
+        self._current_page = None
+        self._owns_current_page = False
\ No newline at end of file
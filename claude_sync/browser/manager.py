@@ -1,15 +1,25 @@
 """Chrome browser process management."""
 import asyncio
 import logging
+import time
 from typing import Optional
 
 import psutil
 from playwright.async_api import Browser, BrowserContext, async_playwright, Playwright
 
 from .config import BrowserConfig
+from .connection import ChromeConnection
 
 logger = logging.getLogger(__name__)
 
+# Seconds a found Chrome process is reused before scanning processes again
+CHROME_SCAN_TTL = 2.0
+
+# Process-wide browser shared by get_shared_connection
+_shared_manager: Optional["ChromeManager"] = None
+_shared_connection: Optional[ChromeConnection] = None
+_shared_lock: Optional[asyncio.Lock] = None
+
 
 class ChromeManager:
     """Manages Chrome browser lifecycle and connections."""
@@ -23,6 +33,8 @@ class ChromeManager:
         self.config = config
         self._browser: Optional[BrowserContext] = None
         self._playwright: Optional[Playwright] = None
+        self._chrome_proc: Optional[psutil.Process] = None
+        self._chrome_proc_ts = 0.0
     
     def is_chrome_running(self) -> bool:
         """Check if Chrome is running with remote debugging.
@@ -30,16 +42,7 @@ class ChromeManager:
         Returns:
             True if Chrome is running with debugging port
         """
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                if 'chrome' in proc.info['name'].lower():
-                    cmdline = proc.info.get('cmdline', [])
-                    if any(f'--remote-debugging-port={self.config.remote_debugging_port}' in arg 
-                           for arg in cmdline):
-                        return True
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        return False
+        return self._scan_chrome() is not None
     
     def get_chrome_pid(self) -> Optional[int]:
         """Get Chrome process ID if running.
@@ -47,16 +50,8 @@ class ChromeManager:
         Returns:
             Process ID or None
         """
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-            try:
-                if 'chrome' in proc.info['name'].lower():
-                    cmdline = proc.info.get('cmdline', [])
-                    if any(f'--remote-debugging-port={self.config.remote_debugging_port}' in arg 
-                           for arg in cmdline):
-                        return proc.info['pid']
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-        return None
+        proc = self._scan_chrome()
+        return proc.pid if proc else None
     
     def get_memory_usage(self) -> float:
         """Get Chrome memory usage in MB.
@@ -64,17 +59,56 @@ class ChromeManager:
         Returns:
             Memory usage in MB or 0.0 if not running
         """
-        pid = self.get_chrome_pid()
-        if not pid:
+        proc = self._scan_chrome()
+        if proc is None:
             return 0.0
         
         try:
-            process = psutil.Process(pid)
-            memory_info = process.memory_info()
+            memory_info = proc.memory_info()
             return memory_info.rss / (1024 * 1024)  # Convert to MB
         except psutil.NoSuchProcess:
             return 0.0
     
+    def _scan_chrome(self) -> Optional[psutil.Process]:
+        """Find the Chrome process using our debugging port in one process scan.
+        
+        A process found within the last CHROME_SCAN_TTL seconds is reused
+        while it is still running.
+        
+        Returns:
+            Chrome process or None if not running
+        """
+        cached = self._chrome_proc
+        if cached is not None and time.monotonic() - self._chrome_proc_ts < CHROME_SCAN_TTL:
+            try:
+                if cached.is_running():
+                    return cached
+            except psutil.NoSuchProcess:
+                pass
+        self._chrome_proc = None
+        
+        needle = f'--remote-debugging-port={self.config.remote_debugging_port}'
+        
+        # Only fetch the name up front; cmdline is read just for Chrome processes
+        for proc in psutil.process_iter(['name']):
+            try:
+                if 'chrome' in proc.info['name'].lower() and needle in ' '.join(proc.cmdline()):
+                    self._chrome_proc = proc
+                    self._chrome_proc_ts = time.monotonic()
+                    return proc
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                continue
+        return None
+    
+    async def _scan_chrome_async(self) -> Optional[psutil.Process]:
+        """Run _scan_chrome in a worker thread so the event loop keeps running.
+        
+        Returns:
+            Chrome process or None if not running
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._scan_chrome)
+    
     async def launch_persistent(self) -> BrowserContext:
         """Launch persistent Chrome instance with user profile.
         
@@ -108,7 +142,7 @@ class ChromeManager:
         Returns:
             Browser context or None if not running
         """
-        if not self.is_chrome_running():
+        if await self._scan_chrome_async() is None:
             logger.info("No existing Chrome instance found")
             return None
         
@@ -143,9 +177,15 @@ class ChromeManager:
     async def get_or_create_browser(self) -> BrowserContext:
         """Get existing browser or create new one.
         
+        The context is kept until close(), so repeated calls share one
+        browser (and its login state) instead of reconnecting or launching.
+        
         Returns:
             Browser context
         """
+        if self._browser is not None:
+            return self._browser
+        
         # Try to connect to existing instance first
         browser = await self.connect_existing()
         if browser:
@@ -156,6 +196,8 @@ class ChromeManager:
     
     async def close(self) -> None:
         """Close browser and cleanup resources."""
+        self._chrome_proc = None
+        
         if self._browser:
             try:
                 await self._browser.close()
@@ -175,6 +217,7 @@ class ChromeManager:
         pid = self.get_chrome_pid()
         if not pid:
             return
+        self._chrome_proc = None
         
         try:
             process = psutil.Process(pid)
@@ -185,4 +228,55 @@ class ChromeManager:
                 logger.warning("Chrome didn't terminate gracefully, force killing")
                 process.kill()
         except psutil.NoSuchProcess:
-            pass
\ No newline at end of file
+            pass
+
+
+async def get_shared_connection(config: Optional[BrowserConfig] = None) -> ChromeConnection:
+    """Get a connection backed by a browser shared across the process.
+    
+    The first call starts Playwright and connects to (or launches) Chrome;
+    later calls reuse it, so callers don't pay browser startup per task.
+    Use acquire_page on the returned connection for concurrent work.
+    
+    Args:
+        config: Browser configuration, used only on the first call
+        
+    Returns:
+        Shared Chrome connection
+    """
+    global _shared_manager, _shared_connection, _shared_lock
+    
+    if _shared_lock is None:
+        _shared_lock = asyncio.Lock()
+    
+    async with _shared_lock:
+        if _shared_connection is None:
+            config = config or BrowserConfig()
+            manager = ChromeManager(config)
+            try:
+                browser = await manager.get_or_create_browser()
+            except BaseException:
+                # Don't leak a half-started Playwright
+                await manager.close()
+                raise
+            _shared_manager = manager
+            _shared_connection = ChromeConnection(
+                browser,
+                page_pool_size=config.max_concurrent_downloads
+            )
+        return _shared_connection
+
+
+async def shutdown_shared_connection() -> None:
+    """Close the shared connection and its browser, if started."""
+    global _shared_manager, _shared_connection, _shared_lock
+    
+    if _shared_connection is not None:
+        await _shared_connection.close()
+        _shared_connection = None
+    
+    if _shared_manager is not None:
+        await _shared_manager.close()
+        _shared_manager = None
+    
+    _shared_lock = None
@@ -1,7 +1,9 @@
 """Knowledge file extractor for Claude.ai project pages."""
+import hashlib
 import re
 import logging
-from typing import List, Optional
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
 from bs4 import BeautifulSoup, NavigableString, Tag
 
@@ -9,21 +11,67 @@ from claude_sync.models import KnowledgeFile
 
 logger = logging.getLogger(__name__)
 
+# Number of distinct pages whose extracted files are remembered
+HTML_CACHE_SIZE = 128
+
+# A line count entry such as "489 lines"
+LINE_COUNT_RE = re.compile(r'^(\d+)\s+lines?$')
+
+# File type labels shown on file entries (lowercased), and labels that are
+# never file names
+FILE_TYPES = frozenset(('text', 'pdf'))
+SKIP_LABELS = frozenset(('Select file', 'Optional', 'Retrieving'))
+
+# Runs inside the page and mirrors _parse_thumbnail_entry, returning the
+# name and paragraph texts of each thumbnail card. Returns null when the
+# page has no thumbnails so callers can fall back to the HTML strategies.
+KNOWLEDGE_FILES_JS = """
+() => {
+    const thumbnails = document.querySelectorAll('div[data-testid="file-thumbnail"]');
+    if (!thumbnails.length) return null;
+    return Array.from(thumbnails).map(thumb => {
+        const h3 = thumb.querySelector('h3');
+        return {
+            name: h3 ? h3.textContent.trim() : '',
+            texts: Array.from(thumb.querySelectorAll('p')).map(p => p.textContent.trim()),
+        };
+    });
+}
+"""
+
 
 class KnowledgeExtractor:
     """Extract knowledge files from Claude.ai project pages."""
     
+    def __init__(self) -> None:
+        """Initialize extractor with an empty page cache."""
+        self._html_cache: "OrderedDict[bytes, Tuple[KnowledgeFile, ...]]" = OrderedDict()
+    
     def extract_from_html(self, html: str) -> List[KnowledgeFile]:
         """Extract knowledge files from HTML string.
         
+        Results are cached by a digest of the HTML, so an unchanged page
+        is not parsed again.
+        
         Args:
             html: Raw HTML content from project page
             
         Returns:
             List of KnowledgeFile objects
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        return self.extract_from_soup(soup)
+        digest = hashlib.blake2b(html.encode('utf-8', 'replace'), digest_size=16).digest()
+        cached = self._html_cache.get(digest)
+        if cached is not None:
+            self._html_cache.move_to_end(digest)
+            return [file.model_copy() for file in cached]
+        
+        soup = BeautifulSoup(html, 'lxml')
+        files = self.extract_from_soup(soup)
+        
+        self._html_cache[digest] = tuple(file.model_copy() for file in files)
+        if len(self._html_cache) > HTML_CACHE_SIZE:
+            self._html_cache.popitem(last=False)
+        return files
     
     def extract_from_soup(self, soup: BeautifulSoup) -> List[KnowledgeFile]:
         """Extract knowledge files from BeautifulSoup object.
@@ -46,12 +94,11 @@ class KnowledgeExtractor:
                     files.append(file_data)
             return files
         
-        # Strategy 2: Find knowledge section and look within it
-        knowledge_header = None
-        for h2 in soup.find_all('h2'):
-            if 'Project knowledge' in h2.get_text():
-                knowledge_header = h2
-                break
+        # Strategy 2: Find knowledge section and look within it, stopping
+        # the search at the first matching header
+        knowledge_header = soup.find(
+            lambda tag: tag.name == 'h2' and 'Project knowledge' in tag.get_text()
+        )
         
         if not knowledge_header:
             logger.debug("No Project knowledge header found")
@@ -81,6 +128,59 @@ class KnowledgeExtractor:
         logger.info(f"Extracted {len(files)} knowledge files")
         return files
     
+    def extract_from_records(self, records: List[Dict[str, Any]]) -> List[KnowledgeFile]:
+        """Extract knowledge files from records returned by KNOWLEDGE_FILES_JS.
+        
+        Args:
+            records: List of dicts with name and texts keys
+            
+        Returns:
+            List of KnowledgeFile objects
+        """
+        files = []
+        
+        for record in records:
+            file_data = self._build_thumbnail_file(
+                record.get('name') or '',
+                record.get('texts') or []
+            )
+            if file_data:
+                files.append(file_data)
+        
+        return files
+    
+    def attach_api_content(
+        self,
+        files: List[KnowledgeFile],
+        docs: List[Dict[str, Any]]
+    ) -> List[KnowledgeFile]:
+        """Fill in file content from claude.ai project docs API records.
+        
+        Files are matched by name, with or without the doc's extension.
+        Files without a matching doc are returned unchanged.
+        
+        Args:
+            files: Files extracted from the page
+            docs: Doc objects from the project docs API (file_name, content)
+            
+        Returns:
+            List of KnowledgeFile objects
+        """
+        contents = {}
+        for doc in docs:
+            file_name = doc.get('file_name')
+            content = doc.get('content')
+            if not file_name or not isinstance(content, str):
+                continue
+            contents.setdefault(file_name, content)
+            contents.setdefault(file_name.rsplit('.', 1)[0], content)
+        
+        return [
+            file.model_copy(update={'content': contents[file.name]})
+            if file.content is None and file.name in contents else file
+            for file in files
+        ]
+    
     def _find_knowledge_container(self, knowledge_header: Tag) -> Optional[Tag]:
         """Find the container that holds knowledge files."""
         # Look for a section first
@@ -126,20 +226,40 @@ class KnowledgeExtractor:
             KnowledgeFile object or None if not valid
         """
         try:
-            # Find the h3 with the file name
-            name_tag = thumbnail_div.find('h3')
+            # Collect the h3 with the file name and all p texts in one walk
+            name_tag = None
+            texts = []
+            for element in thumbnail_div.descendants:
+                tag_name = getattr(element, 'name', None)
+                if tag_name == 'p':
+                    texts.append(element.get_text(strip=True))
+                elif tag_name == 'h3' and name_tag is None:
+                    name_tag = element
+            
             if not name_tag:
                 return None
+        except Exception:
+            return None
+        
+        return self._build_thumbnail_file(name_tag.get_text(strip=True), texts)
+    
+    def _build_thumbnail_file(self, name: str, texts: List[str]) -> Optional[KnowledgeFile]:
+        """Build a KnowledgeFile from a thumbnail's name and paragraph texts.
+        
+        Args:
+            name: Text of the thumbnail's h3
+            texts: Stripped texts of the thumbnail's p tags
             
-            name = name_tag.get_text(strip=True)
+        Returns:
+            KnowledgeFile object or None if not valid
+        """
+        try:
             if not name:
                 return None
             
             # Find line count
             lines = None
-            line_tags = thumbnail_div.find_all('p')
-            for p in line_tags:
-                text = p.get_text(strip=True)
+            for text in texts:
                 if 'lines' in text:
                     try:
                         lines = int(text.split()[0])
@@ -149,19 +269,25 @@ class KnowledgeExtractor:
             
             # Find file type
             file_type = None
-            for p in line_tags:
-                text = p.get_text(strip=True).lower()
-                if text in ['text', 'pdf']:
+            for text in texts:
+                text = text.lower()
+                if text in FILE_TYPES:
                     file_type = text
                     break
             
-            # If no explicit type found, default to text for files with lines
+            # If no explicit type found, default to text for files with lines;
+            # anything else is not a type KnowledgeFile accepts
             if not file_type and lines:
                 file_type = "text"
             elif not file_type:
-                file_type = "unknown"
+                return None
             
-            return KnowledgeFile(
+            if lines is not None and lines < 0:
+                return None
+            
+            # Every field is checked above, so skip model validation on this
+            # per-thumbnail path
+            return KnowledgeFile.model_construct(
                 name=name,
                 file_type=file_type,
                 lines=lines
@@ -185,30 +311,28 @@ class KnowledgeExtractor:
         Returns:
             KnowledgeFile object or None if not a valid file entry
         """
-        # Get all text nodes and child elements
-        contents = list(div.children)
-        if not contents:
-            return None
-        
-        # Look for button - indicates this is a file entry
-        has_button = div.find('button') is not None
-        if not has_button:
-            return None
-        
-        # Extract text content
+        # Extract text content from the children in one lazy pass, noting
+        # any button - it indicates this is a file entry
+        has_button = False
         text_parts = []
-        for item in contents:
+        for item in div.children:
             if isinstance(item, NavigableString):
-                text = str(item).strip()
-                if text:
-                    # Split by newlines to handle multi-line text nodes
-                    lines = [line.strip() for line in text.split('\n') if line.strip()]
-                    text_parts.extend(lines)
-            elif isinstance(item, Tag) and item.name != 'button':
+                # Split by newlines to handle multi-line text nodes, stripping
+                # each line once
+                lines = (line.strip() for line in item.splitlines())
+                text_parts.extend(line for line in lines if line)
+            elif isinstance(item, Tag):
+                if item.name == 'button':
+                    has_button = True
+                    continue
                 text = item.get_text(strip=True)
                 if text:
                     text_parts.append(text)
         
+        # Buttons nested deeper than a direct child still count
+        if not has_button and div.find('button') is None:
+            return None
+        
         if not text_parts:
             return None
         
@@ -219,18 +343,19 @@ class KnowledgeExtractor:
         
         for i, part in enumerate(text_parts):
             # Check if this is a line count
-            lines_match = re.match(r'^(\d+)\s+lines?$', part)
+            lines_match = LINE_COUNT_RE.match(part)
             if lines_match:
                 lines = int(lines_match.group(1))
                 continue
             
             # Check if this is a file type
-            if part.upper() in ['TEXT', 'PDF']:
-                file_type = part.lower()
+            lowered = part.lower()
+            if lowered in FILE_TYPES:
+                file_type = lowered
                 continue
             
             # Otherwise, it's likely the file name
-            if name is None and part not in ['Select file', 'Optional', 'Retrieving']:
+            if name is None and part not in SKIP_LABELS:
                 name = part
         
         # Valid file entry must have name and type
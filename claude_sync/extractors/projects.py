@@ -1,11 +1,31 @@
 """Project extractor for Claude.ai projects page."""
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from bs4 import BeautifulSoup, Tag
 
 from claude_sync.models import Project
 
 
+# Runs inside the page and mirrors _parse_project_card, returning only the
+# fields we need instead of the full serialized DOM.
+PROJECT_CARDS_JS = """
+() => Array.from(document.querySelectorAll('a[href*="/project/"]')).map(a => {
+    const container = Array.from(a.children).find(el => el.tagName === 'DIV');
+    const inner = container
+        ? Array.from(container.children).filter(el => el.tagName === 'DIV')
+        : [];
+    return {
+        href: a.getAttribute('href') || '',
+        name: inner[0] ? inner[0].textContent.trim() : '',
+        description: inner[1] ? inner[1].textContent.trim() : null,
+    };
+})
+"""
+
+# Text that marks a card's second line as update info, not a description
+UPDATE_MARKERS = frozenset(('Updated', 'ago'))
+
+
 class ProjectExtractor:
     """Extract projects from Claude.ai HTML pages."""
     
@@ -18,7 +38,7 @@ class ProjectExtractor:
         Returns:
             List of Project objects
         """
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = BeautifulSoup(html, 'lxml')
         return self.extract_from_soup(soup)
     
     def extract_from_soup(self, soup: BeautifulSoup) -> List[Project]:
@@ -33,7 +53,7 @@ class ProjectExtractor:
         projects = []
         
         # Find all project links
-        project_links = soup.find_all('a', href=lambda x: x and '/project/' in x)
+        project_links = soup.select('a[href*="/project/"]')
         
         for link in project_links:
             project = self._parse_project_card(link)
@@ -42,6 +62,57 @@ class ProjectExtractor:
         
         return projects
     
+    def extract_from_records(self, records: List[Dict[str, Any]]) -> List[Project]:
+        """Extract projects from records returned by PROJECT_CARDS_JS.
+        
+        Args:
+            records: List of dicts with href, name and description keys
+            
+        Returns:
+            List of Project objects
+        """
+        projects = []
+        
+        for record in records:
+            project = self._build_project(
+                record.get('href') or '',
+                record.get('name') or '',
+                record.get('description')
+            )
+            if project:
+                projects.append(project)
+        
+        return projects
+    
+    def extract_from_api(self, records: List[Dict[str, Any]]) -> List[Project]:
+        """Extract projects from claude.ai projects API records.
+        
+        Args:
+            records: Project objects from the projects API (uuid, name, description)
+            
+        Returns:
+            List of Project objects
+        """
+        projects = []
+        
+        for record in records:
+            project_id = record.get('uuid')
+            name = record.get('name')
+            if not project_id or not name:
+                continue
+            
+            # The URL is built here and the other fields are checked above,
+            # so the record can skip model validation
+            description = record.get('description')
+            projects.append(Project.model_construct(
+                id=str(project_id),
+                name=str(name),
+                url=f"https://claude.ai/project/{project_id}",
+                description=str(description) if description else None
+            ))
+        
+        return projects
+    
     def _parse_project_card(self, link: Tag) -> Optional[Project]:
         """Parse a single project card.
         
@@ -51,39 +122,54 @@ class ProjectExtractor:
         Returns:
             Project object or None if parsing fails
         """
-        # Extract project ID from URL
         href = link.get('href', '')
         if not href or '/project/' not in href:
             return None
         
-        project_id = href.split('/project/')[-1]
-        if not project_id:
+        # The first div inside the link contains the project info
+        container_div = next((c for c in link.children if c.name == 'div'), None)
+        if container_div is None:
             return None
         
-        # Find divs inside the link
-        divs = link.find_all('div', recursive=False)
-        if not divs:
+        # Name is the first div, description the second (if present)
+        inner_divs = (c for c in container_div.children if c.name == 'div')
+        name_div = next(inner_divs, None)
+        if name_div is None:
             return None
         
-        # The first div inside the link contains the project info
-        container_div = divs[0]
-        inner_divs = container_div.find_all('div', recursive=False)
+        name = name_div.get_text(strip=True)
+        description_div = next(inner_divs, None)
+        description = None
+        if description_div is not None:
+            description = description_div.get_text(strip=True)
         
-        if not inner_divs:
-            return None
+        return self._build_project(href, name, description)
+    
+    def _build_project(
+        self,
+        href: str,
+        name: str,
+        description: Optional[str]
+    ) -> Optional[Project]:
+        """Build a Project from raw card fields.
         
-        # Extract name (first div)
-        name = inner_divs[0].get_text(strip=True)
-        if not name:
+        Args:
+            href: Link target of the project card
+            name: Project name text
+            description: Second line of the card, if any
+            
+        Returns:
+            Project object or None if the fields are not a valid project
+        """
+        # Extract project ID from URL
+        _, sep, project_id = href.rpartition('/project/')
+        if not sep or not project_id or not name:
             return None
         
-        # Extract description (second div, if exists and not "Updated")
-        description = None
-        if len(inner_divs) > 1:
-            second_div_text = inner_divs[1].get_text(strip=True)
-            # Check if this is the description or the update info
-            if not any(keyword in second_div_text for keyword in ['Updated', 'ago']):
-                description = second_div_text
+        # Check if this is the description or the update info
+        if description is not None:
+            if any(keyword in description for keyword in UPDATE_MARKERS):
+                description = None
         
         # Build full URL
         url = f"https://claude.ai{href}" if href.startswith('/') else href
@@ -3,7 +3,7 @@ import hashlib
 from datetime import datetime
 from typing import Literal, Optional
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, field_serializer
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
 
 
 FileType = Literal["text", "pdf"]
@@ -20,14 +20,6 @@ class KnowledgeFile(BaseModel):
     created_at: Optional[datetime] = Field(None, description="Creation time")
     updated_at: Optional[datetime] = Field(None, description="Last update time")
     
-    @field_validator("file_type")
-    @classmethod
-    def validate_file_type(cls, v: str) -> str:
-        """Ensure file type is valid."""
-        if v not in ["text", "pdf"]:
-            raise ValueError(f"Invalid file type: {v}")
-        return v
-    
     @field_serializer('created_at', 'updated_at')
     def serialize_datetime(self, v: Optional[datetime]) -> Optional[str]:
         """Serialize datetime to ISO format."""
@@ -2,7 +2,11 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, ConfigDict, Field, field_validator, field_serializer
+from pydantic import BaseModel, ConfigDict, Field, field_serializer
+
+
+# Claude.ai project URLs (localhost is allowed for testing)
+PROJECT_URL_PATTERN = r"^(https://claude\.ai/project/|http://localhost)"
 
 
 class Project(BaseModel):
@@ -10,19 +14,10 @@ class Project(BaseModel):
     
     id: str = Field(..., min_length=1, description="Unique project ID")
     name: str = Field(..., min_length=1, description="Project name")
-    url: str = Field(..., min_length=1, description="Project URL")
+    url: str = Field(..., pattern=PROJECT_URL_PATTERN, description="Project URL")
     description: Optional[str] = Field(None, description="Project description")
     updated_at: Optional[datetime] = Field(None, description="Last update time")
     
-    @field_validator("url")
-    @classmethod
-    def validate_url(cls, v: str) -> str:
-        """Ensure URL is valid Claude project URL."""
-        if not v.startswith(("https://claude.ai/project/", "http://localhost")):
-            # Allow localhost for testing
-            raise ValueError("URL must be a valid Claude.ai project URL")
-        return v
-    
     @field_serializer('updated_at')
     def serialize_datetime(self, v: Optional[datetime]) -> Optional[str]:
         """Serialize datetime to ISO format."""
@@ -1,16 +1,34 @@
 """Orchestrates the sync process for Claude.ai data."""
 import asyncio
+import hashlib
 import logging
+import time
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Callable
 from datetime import datetime
 
 from claude_sync.browser import BrowserConfig, ChromeManager, ChromeConnection
+from claude_sync.browser.connection import (
+    CLICK_THUMBNAIL_JS,
+    DIALOG_SELECTOR,
+    PROJECT_LINK_SELECTOR,
+)
 from claude_sync.models import Project, KnowledgeFile
 from .storage import LocalStorage
 
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between progress callbacks (20 Hz); UIs can't redraw faster
+PROGRESS_CALLBACK_INTERVAL = 0.05
+
+# Content at least this long (in characters) is hashed on a worker thread
+HASH_OFFLOAD_THRESHOLD = 64 * 1024
+
+
+def _sha256_hex(content: str) -> str:
+    """SHA-256 hex digest of content encoded as UTF-8."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
 
 class SyncProgress:
     """Tracks sync progress."""
@@ -64,6 +82,9 @@ class SyncOrchestrator:
         self.browser_config = browser_config or BrowserConfig()
         self.progress_callback = progress_callback
         self.progress = SyncProgress()
+        self._last_callback_mono = 0.0
+        # project.id -> storage sync status, read once per project per run
+        self._status_cache: Dict[str, Dict[str, Any]] = {}
     
     async def sync_all(self, filter_projects: Optional[List[str]] = None) -> Dict[str, Any]:
         """Sync all projects and their knowledge files.
@@ -74,14 +95,20 @@ class SyncOrchestrator:
         Returns:
             Sync summary
         """
-        start_time = datetime.now()
+        # Time the sync on the monotonic clock; wall time is only needed for last_sync
+        start_time = time.monotonic()
         logger.info("Starting full sync...")
         
         manager = ChromeManager(self.browser_config)
+        connection: Optional[ChromeConnection] = None
         
         try:
             browser = await manager.get_or_create_browser()
-            connection = ChromeConnection(browser)
+            # One pool page per concurrent download, so the semaphore is the only limit
+            connection = ChromeConnection(
+                browser,
+                page_pool_size=self.browser_config.max_concurrent_downloads
+            )
             
             # Check login
             if not await connection.is_logged_in():
@@ -90,7 +117,7 @@ class SyncOrchestrator:
             # Get all projects
             logger.info("Fetching project list...")
             await connection.navigate("https://claude.ai/projects")
-            await asyncio.sleep(3)
+            await connection.wait_for_selector(PROJECT_LINK_SELECTOR, timeout=10000)
             
             projects = await connection.extract_projects()
             logger.info(f"Found {len(projects)} projects")
@@ -116,7 +143,7 @@ class SyncOrchestrator:
             self.storage.update_sync_state(sync_state)
             
             # Summary
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.monotonic() - start_time
             summary = {
                 "success": True,
                 "duration_seconds": duration,
@@ -136,7 +163,14 @@ class SyncOrchestrator:
                 "progress": self.progress.to_dict()
             }
         finally:
-            await manager.close()
+            # Deliver any update swallowed by the throttle
+            self._flush_progress()
+            # Close the pool's extra tabs before letting go of the browser
+            try:
+                if connection is not None:
+                    await connection.close()
+            finally:
+                await manager.close()
     
     async def sync_project(self, project_name: str) -> Dict[str, Any]:
         """Sync a single project.
@@ -162,6 +196,7 @@ class SyncOrchestrator:
         """
         logger.info(f"Syncing project: {project.name}")
         self.progress.current_project = project.name
+        self._status_cache.pop(project.id, None)
         self._update_progress()
         
         try:
@@ -170,7 +205,8 @@ class SyncOrchestrator:
             
             # Navigate to project
             await connection.navigate(project.url, timeout=90000)
-            await asyncio.sleep(5)  # Let page fully load
+            # Let the file list render, or the empty-project message show
+            await connection.wait_for_knowledge_files(timeout=8000)
             
             # Extract knowledge files
             files = await connection.extract_knowledge_files()
@@ -180,13 +216,46 @@ class SyncOrchestrator:
             self.progress.total_files += len(files)
             self._update_progress()
             
-            # Download each file
-            for file in files:
-                await self._sync_knowledge_file(connection, project, file)
+            completed_before = self.progress.completed_files
+            
+            # Download files in parallel; the connection hands each one a pooled page
+            semaphore = asyncio.Semaphore(self.browser_config.max_concurrent_downloads)
+            
+            async def bounded_sync(file: KnowledgeFile) -> int:
+                async with semaphore:
+                    return await self._sync_knowledge_file(connection, project, file)
+            
+            synced_files = self._get_project_status(project)["synced_files"]
+            results = await asyncio.gather(
+                *(bounded_sync(file) for file in files),
+                return_exceptions=True
+            )
+            for file, result in zip(files, results):
+                if isinstance(result, BaseException):
+                    logger.error(f"Failed to sync file {file.name}: {result}")
+                    self.progress.errors.append({
+                        "type": "file_sync",
+                        "project": project.name,
+                        "file": file.name,
+                        "error": str(result)
+                    })
+            
+            logger.info(
+                f"Project {project.name}: "
+                f"{self.progress.completed_files - completed_before}/{len(files)} files, "
+                f"{sum(r for r in results if isinstance(r, int))} bytes saved"
+            )
+            
+            # Remember the files still in the project for the next sync
+            self.storage.save_synced_files(project, {
+                file.name: synced_files[file.name]
+                for file in files
+                if file.name in synced_files
+            })
             
             # Mark project complete
             self.progress.completed_projects += 1
-            self._update_progress()
+            self._flush_progress()
             
         except Exception as e:
             logger.error(f"Failed to sync project {project.name}: {e}")
@@ -201,41 +270,57 @@ class SyncOrchestrator:
         connection: ChromeConnection,
         project: Project,
         file: KnowledgeFile
-    ) -> None:
+    ) -> int:
         """Sync a single knowledge file.
         
         Args:
             connection: Browser connection
             project: Project containing the file
             file: File to sync
+            
+        Returns:
+            Number of bytes written (0 if unchanged or failed)
         """
-        logger.info(f"Downloading: {file.name}")
+        # Per-file lines are DEBUG with lazy formatting; _sync_project logs a summary
+        logger.debug("Downloading: %s", file.name)
         self.progress.current_file = file.name
         self._update_progress()
         
+        written = 0
         try:
-            # Check if already synced
-            project_status = self.storage.get_project_sync_status(project)
-            if project_status["synced"]:
-                # For now, always re-download
-                # TODO: Add checksum/modification time checking
-                pass
+            synced_files = self._get_project_status(project)["synced_files"]
             
-            # Download content
-            content = await connection.download_file_content(file.name)
+            # Use content captured from the project API, else download it
+            content = file.content
+            if content is None:
+                content = await connection.download_file_content(file.name)
             
             if content is None:
                 # Try alternative download method
                 logger.warning(f"Standard download failed for {file.name}, trying alternative...")
                 content = await self._alternative_download(connection, file)
             
-            if content:
-                # Save file
-                saved_path = self.storage.save_knowledge_file(project, file, content)
-                logger.info(f"Saved: {saved_path}")
-            else:
+            if not content:
                 raise Exception("Failed to download file content")
             
+            # Skip the write when the last sync's copy is unchanged and still on disk
+            digest = await self._content_digest(content)
+            record = synced_files.get(file.name)
+            if self.storage.has_synced_copy(project, record, digest):
+                logger.debug("Unchanged: %s", file.name)
+            else:
+                # Changed content replaces the last sync's copy rather than adding one
+                saved_path = self.storage.save_knowledge_file(
+                    project, file, content,
+                    existing_path=record.get("path") if isinstance(record, dict) else None
+                )
+                synced_files[file.name] = {
+                    "sha256": digest,
+                    "path": saved_path.relative_to(self.storage.get_project_path(project)).as_posix()
+                }
+                written = saved_path.stat().st_size
+                logger.debug("Saved: %s", saved_path)
+            
             # Update progress
             self.progress.completed_files += 1
             self._update_progress()
@@ -248,6 +333,40 @@ class SyncOrchestrator:
                 "file": file.name,
                 "error": str(e)
             })
+        return written
+    
+    async def _content_digest(self, content: str) -> str:
+        """Hash file content, off the event loop when it is large.
+        
+        Matches KnowledgeFile.calculate_content_hash for the same content.
+        
+        Args:
+            content: Downloaded content
+            
+        Returns:
+            SHA-256 hex digest of the content
+        """
+        if len(content) < HASH_OFFLOAD_THRESHOLD:
+            return _sha256_hex(content)
+        
+        # hashlib releases the GIL on large buffers, so other downloads keep running
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, _sha256_hex, content)
+    
+    def _get_project_status(self, project: Project) -> Dict[str, Any]:
+        """Get a project's sync status, reading project.json once per run.
+        
+        Args:
+            project: Project to check
+            
+        Returns:
+            Sync status information
+        """
+        status = self._status_cache.get(project.id)
+        if status is None:
+            status = self.storage.get_project_sync_status(project)
+            self._status_cache[project.id] = status
+        return status
     
     async def _alternative_download(
         self,
@@ -260,41 +379,58 @@ class SyncOrchestrator:
             connection: Browser connection
             file: File to download
             
+        Runs on a page from the connection's download pool, like the
+        standard download, so it never shares a page with another download.
+        
         Returns:
             File content or None
         """
-        page = await connection.get_or_create_page()
+        page = await connection.acquire_page()
         
         try:
-            # Find the file thumbnail
-            thumbnails = await page.query_selector_all('div[data-testid="file-thumbnail"]')
-            
-            for thumb in thumbnails:
-                # Check if this is our file
-                h3 = await thumb.query_selector('h3')
-                if h3:
-                    name = await h3.text_content()
-                    if name and name.strip() == file.name:
-                        # Click to open file
-                        button = await thumb.query_selector('button')
-                        if button:
-                            await button.click()
-                            await asyncio.sleep(2)
-                            
-                            # Look for file content in modal or new view
-                            # This would need to be adapted based on Claude's UI
-                            # For now, return None
-                            logger.warning("Alternative download not fully implemented")
-                            return None
+            # Find the file thumbnail and click it in one evaluate
+            clicked = await page.evaluate(CLICK_THUMBNAIL_JS, file.name)
+            if not clicked:
+                raise Exception(f"File not found: {file.name}")
+            
+            try:
+                await page.wait_for_selector(DIALOG_SELECTOR, timeout=5000)
+            except Exception:
+                logger.debug(f"No modal appeared for {file.name}")
+            
+            # Look for file content in modal or new view
+            # This would need to be adapted based on Claude's UI
+            # For now, return None
+            logger.warning("Alternative download not fully implemented")
+            return None
             
         except Exception as e:
             logger.error(f"Alternative download failed: {e}")
+        finally:
+            # Leave the page clean for the next pooled download
+            await connection.close_modal(page)
+            connection.release_page(page)
         
         return None
     
     def _update_progress(self):
-        """Update progress and call callback if set."""
+        """Update progress and call callback if set.
+        
+        Calls are throttled to one per PROGRESS_CALLBACK_INTERVAL so per-file
+        updates don't flood the callback; milestones use _flush_progress.
+        """
+        if not self.progress_callback:
+            return
+        now = time.monotonic()
+        if now - self._last_callback_mono < PROGRESS_CALLBACK_INTERVAL:
+            return
+        self._last_callback_mono = now
+        self.progress_callback(self.progress)
+    
+    def _flush_progress(self):
+        """Call the progress callback unconditionally, bypassing the throttle."""
         if self.progress_callback:
+            self._last_callback_mono = time.monotonic()
             self.progress_callback(self.progress)
     
     def get_sync_status(self) -> Dict[str, Any]:
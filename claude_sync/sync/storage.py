@@ -1,14 +1,77 @@
 """Local storage management for synced Claude data."""
 import json
 import logging
+import os
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 
 from claude_sync.models import Project, KnowledgeFile
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Characters that are unsafe in file names, mapped in a single translate pass
+SANITIZE_TABLE = str.maketrans({
+    '/': '-',
+    '\\': '-',
+    ':': '-',
+    '*': '-',
+    '?': '-',
+    '"': '',
+    '<': '-',
+    '>': '-',
+    '|': '-',
+    '\n': ' ',
+    '\r': ' '
+})
+
+
+def _read_json(path: Path) -> Any:
+    """Load a JSON file, using orjson when it is installed.
+    
+    Args:
+        path: File to read
+        
+    Returns:
+        Parsed JSON data
+    """
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def _write_json(path: Path, data: Any) -> None:
+    """Atomically write data as indented JSON, using orjson when it is installed.
+    
+    The data is fsynced to a temp file that then replaces the target, so a
+    crash mid-write never leaves a truncated file behind.
+    
+    Args:
+        path: File to write
+        data: JSON-serializable data
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode('utf-8')
+    
+    tmp_path = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
 
 class LocalStorage:
     """Manages local storage of synced Claude data."""
@@ -29,6 +92,9 @@ class LocalStorage:
         # Create directories
         self.projects_dir.mkdir(exist_ok=True)
         self.metadata_dir.mkdir(exist_ok=True)
+        
+        # Last sync state read or written by this process
+        self._sync_state_cache: Optional[Dict[str, Any]] = None
     
     def get_project_path(self, project: Project) -> Path:
         """Get local path for a project.
@@ -58,20 +124,53 @@ class LocalStorage:
             "description": project.description,
             "url": project.url,
             "last_synced": datetime.now().isoformat(),
-            "project_id": project.url.split("/")[-1]  # Extract ID from URL
+            "project_id": project.url.split("/")[-1],  # Extract ID from URL
+            "files": {}
         }
         
         metadata_file = project_path / "project.json"
-        with open(metadata_file, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        # Keep the previous sync's file records so unchanged files can be skipped
+        if metadata_file.exists():
+            metadata["files"] = _read_json(metadata_file).get("files", {})
+        _write_json(metadata_file, metadata)
         
         logger.info(f"Saved metadata for project: {project.name}")
     
+    def save_synced_files(self, project: Project, synced_files: Dict[str, Dict[str, str]]) -> None:
+        """Record where a project's synced files were saved and their hashes.
+        
+        Args:
+            project: Project the files belong to
+            synced_files: Mapping of file name to {"sha256": hex digest,
+                "path": saved path relative to the project directory}
+        """
+        metadata_file = self.get_project_path(project) / "project.json"
+        metadata = _read_json(metadata_file) if metadata_file.exists() else {}
+        metadata["files"] = synced_files
+        _write_json(metadata_file, metadata)
+    
+    def has_synced_copy(self, project: Project, record: Any, digest: str) -> bool:
+        """Check that a synced file record matches content still on disk.
+        
+        Args:
+            project: Project the file belongs to
+            record: Entry from the project's synced files, if any
+            digest: SHA-256 hex digest of the current content
+            
+        Returns:
+            True if the recorded hash matches and the saved file still exists
+        """
+        if not isinstance(record, dict) or record.get("sha256") != digest:
+            return False
+        path = record.get("path")
+        return bool(path) and (self.get_project_path(project) / path).is_file()
+    
     def save_knowledge_file(
         self, 
         project: Project, 
         file: KnowledgeFile, 
-        content: str
+        content: str,
+        existing_path: Optional[str] = None
     ) -> Path:
         """Save a knowledge file.
         
@@ -79,6 +178,9 @@ class LocalStorage:
             project: Project containing the file
             file: KnowledgeFile metadata
             content: File content
+            existing_path: Path a previous sync saved this file to, relative
+                to the project directory; it is overwritten in place instead
+                of saving a new copy
             
         Returns:
             Path to saved file
@@ -87,28 +189,50 @@ class LocalStorage:
         knowledge_dir = project_path / "knowledge"
         knowledge_dir.mkdir(exist_ok=True)
         
+        file_path = project_path / existing_path if existing_path else None
+        if file_path is None or file_path.parent != knowledge_dir:
+            file_path = knowledge_dir / self._new_file_name(knowledge_dir, file)
+        
+        # Encode once and write through a temp file so readers never see a partial file
+        data = content.encode('utf-8')
+        tmp_path = file_path.with_name(file_path.name + ".tmp")
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        
+        logger.debug("Saved knowledge file: %s", file_path)
+        return file_path
+    
+    def _new_file_name(self, knowledge_dir: Path, file: KnowledgeFile) -> str:
+        """Pick an unused file name for a knowledge file.
+        
+        Args:
+            knowledge_dir: Directory the file is saved in
+            file: KnowledgeFile metadata
+            
+        Returns:
+            Sanitized file name, suffixed if the name is already taken
+        """
         # Create safe filename
         safe_name = self._sanitize_name(file.name)
         if not safe_name.endswith(f".{file.file_type}"):
             safe_name = f"{safe_name}.{file.file_type}"
         
-        file_path = knowledge_dir / safe_name
-        
-        # Handle potential duplicates
-        if file_path.exists():
-            base_name = file_path.stem
-            extension = file_path.suffix
+        # Handle potential duplicates with one directory scan instead of a stat per probe
+        with os.scandir(knowledge_dir) as entries:
+            existing = {entry.name for entry in entries}
+        if safe_name in existing:
+            base_name, extension = os.path.splitext(safe_name)
             counter = 1
-            while file_path.exists():
-                file_path = knowledge_dir / f"{base_name}_{counter}{extension}"
+            while f"{base_name}_{counter}{extension}" in existing:
                 counter += 1
+            safe_name = f"{base_name}_{counter}{extension}"
         
-        # Save content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        logger.info(f"Saved knowledge file: {file_path}")
-        return file_path
+        return safe_name
     
     def get_sync_state(self) -> Dict[str, Any]:
         """Get current sync state.
@@ -116,18 +240,20 @@ class LocalStorage:
         Returns:
             Dictionary with sync state information
         """
-        state_file = self.metadata_dir / "sync_state.json"
-        
-        if state_file.exists():
-            with open(state_file, 'r') as f:
-                return json.load(f)
-        
-        return {
-            "last_sync": None,
-            "projects_synced": [],
-            "total_files": 0,
-            "version": "1.0"
-        }
+        if self._sync_state_cache is None:
+            state_file = self.metadata_dir / "sync_state.json"
+            
+            if state_file.exists():
+                self._sync_state_cache = _read_json(state_file)
+            else:
+                self._sync_state_cache = {
+                    "last_sync": None,
+                    "projects_synced": [],
+                    "total_files": 0,
+                    "version": "1.0"
+                }
+        
+        return dict(self._sync_state_cache)
     
     def update_sync_state(self, state: Dict[str, Any]) -> None:
         """Update sync state.
@@ -137,8 +263,8 @@ class LocalStorage:
         """
         state_file = self.metadata_dir / "sync_state.json"
         
-        with open(state_file, 'w') as f:
-            json.dump(state, f, indent=2)
+        _write_json(state_file, state)
+        self._sync_state_cache = dict(state)
     
     def get_project_sync_status(self, project: Project) -> Dict[str, Any]:
         """Get sync status for a specific project.
@@ -156,20 +282,24 @@ class LocalStorage:
             return {
                 "synced": False,
                 "last_synced": None,
-                "files_count": 0
+                "files_count": 0,
+                "synced_files": {}
             }
         
-        with open(metadata_file, 'r') as f:
-            metadata = json.load(f)
+        metadata = _read_json(metadata_file)
         
         # Count knowledge files
         knowledge_dir = project_path / "knowledge"
-        files_count = len(list(knowledge_dir.glob("*"))) if knowledge_dir.exists() else 0
+        files_count = 0
+        if knowledge_dir.exists():
+            with os.scandir(knowledge_dir) as entries:
+                files_count = sum(1 for _ in entries)
         
         return {
             "synced": True,
             "last_synced": metadata.get("last_synced"),
-            "files_count": files_count
+            "files_count": files_count,
+            "synced_files": metadata.get("files", {})
         }
     
     def list_synced_projects(self) -> List[Dict[str, Any]]:
@@ -180,16 +310,19 @@ class LocalStorage:
         """
         projects = []
         
-        for project_dir in self.projects_dir.iterdir():
-            if project_dir.is_dir():
-                metadata_file = project_dir / "project.json"
-                if metadata_file.exists():
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                    
-                    # Add local path info
-                    metadata["local_path"] = str(project_dir)
-                    projects.append(metadata)
+        # DirEntry.is_dir uses the type from the directory listing, so no stat per entry
+        with os.scandir(self.projects_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                try:
+                    metadata = _read_json(Path(entry.path) / "project.json")
+                except FileNotFoundError:
+                    continue
+                
+                # Add local path info
+                metadata["local_path"] = entry.path
+                projects.append(metadata)
         
         return projects
     
@@ -203,23 +336,7 @@ class LocalStorage:
             Sanitized name safe for filesystem
         """
         # Replace problematic characters
-        replacements = {
-            '/': '-',
-            '\\': '-',
-            ':': '-',
-            '*': '-',
-            '?': '-',
-            '"': '',
-            '<': '-',
-            '>': '-',
-            '|': '-',
-            '\n': ' ',
-            '\r': ' '
-        }
-        
-        safe_name = name
-        for old, new in replacements.items():
-            safe_name = safe_name.replace(old, new)
+        safe_name = name.translate(SANITIZE_TABLE)
         
         # Remove multiple spaces and trim
         safe_name = ' '.join(safe_name.split())
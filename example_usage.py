@@ -62,7 +62,11 @@ async def example_sync():
 async def example_custom_sync():
     """Example with custom filtering."""
     
-    orchestrator = SyncOrchestrator(Path("filtered_backup"))
+    # Each project's files download in parallel, up to this many at once.
+    # Pass all projects to one sync_all rather than gathering sync_project
+    # calls: they would each open a browser and navigate the same page.
+    browser_config = BrowserConfig(max_concurrent_downloads=5)
+    orchestrator = SyncOrchestrator(Path("filtered_backup"), browser_config=browser_config)
     
     # Sync only specific projects
     projects_to_sync = ["Project A", "Project B", "Important Research"]
@@ -5,6 +5,12 @@ import random
 from pathlib import Path
 from bs4 import BeautifulSoup
 
+# Patterns compiled once at import instead of inside each sanitize pass
+PROJECT_HREF_RE = re.compile(r'/project/[a-f0-9-]+')
+PROJECT_UUID_HREF_RE = re.compile(r'/project/[a-f0-9-]{36}')
+EMAIL_RE = re.compile(r'[\w\.-]+@[\w\.-]+\.\w+')
+UUID_RE = re.compile(r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}')
+
 
 def generate_project_name(index):
     """Generate generic project name."""
@@ -45,7 +51,7 @@ def sanitize_projects_page(html):
     soup = BeautifulSoup(html, 'html.parser')
     
     # Find all project cards
-    project_cards = soup.find_all('a', href=re.compile(r'/project/[a-f0-9-]+'))
+    project_cards = soup.find_all('a', href=PROJECT_HREF_RE)
     
     project_counter = 1
     for card in project_cards:
@@ -68,7 +74,7 @@ def sanitize_projects_page(html):
     
     # Replace any remaining project IDs in the HTML
     html_str = str(soup)
-    html_str = re.sub(r'/project/[a-f0-9-]{36}', lambda m: f"/project/project-{random.randint(1,100):03d}", html_str)
+    html_str = PROJECT_UUID_HREF_RE.sub(lambda m: f"/project/project-{random.randint(1,100):03d}", html_str)
     
     return html_str
 
@@ -119,11 +125,10 @@ def sanitize_project_page(html):
     
     # Replace any email addresses
     html_str = str(soup)
-    html_str = re.sub(r'[\w\.-]+@[\w\.-]+\.\w+', 'user@example.com', html_str)
+    html_str = EMAIL_RE.sub('user@example.com', html_str)
     
     # Replace any remaining UUIDs
-    html_str = re.sub(r'[a-f0-9]{8}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{4}-[a-f0-9]{12}', 
-                      lambda m: f"sample-id-{random.randint(1000, 9999)}", html_str)
+    html_str = UUID_RE.sub(lambda m: f"sample-id-{random.randint(1000, 9999)}", html_str)
     
     return html_str
 
@@ -28,13 +28,6 @@ def test_imports():
         print("✗ beautifulsoup4 - Run: pip install beautifulsoup4")
         return False
     
-    try:
-        import aiofiles
-        print("✓ aiofiles")
-    except ImportError:
-        print("✗ aiofiles - Run: pip install aiofiles")
-        return False
-    
     try:
         from claude_sync import SyncOrchestrator
         from claude_sync.browser import BrowserConfig, ChromeManager
@@ -94,7 +87,7 @@ async def test_claude_login():
                 
                 # Try to get projects
                 await connection.navigate("https://claude.ai/projects")
-                await asyncio.sleep(3)
+                await connection.wait_for_selector('a[href*="/project/"]', timeout=10000)
                 
                 projects = await connection.extract_projects()
                 print(f"✓ Found {len(projects)} projects")
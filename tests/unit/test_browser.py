@@ -1,6 +1,7 @@
 """Tests for browser management."""
 import asyncio
 import sys
+import time
 from pathlib import Path
 from typing import AsyncGenerator, Generator
 from unittest.mock import Mock, patch, AsyncMock, MagicMock
@@ -9,7 +10,18 @@ import pytest
 import psutil
 from playwright.async_api import Browser, BrowserContext, Page, async_playwright
 
-from claude_sync.browser import ChromeManager, ChromeConnection, BrowserConfig
+from claude_sync.browser import (
+    BrowserConfig,
+    ChromeConnection,
+    ChromeManager,
+    get_shared_connection,
+    shutdown_shared_connection,
+)
+from claude_sync.browser.connection import (
+    BLOCKED_URL_PATTERNS,
+    DIALOG_SELECTOR,
+    KNOWLEDGE_READY_JS,
+)
 
 
 class TestChromeManager:
@@ -54,10 +66,39 @@ class TestChromeManager:
             assert manager.get_chrome_pid() == 123
         
         # Test when Chrome is not running
+        mock_proc.is_running.return_value = False
         mock_proc.info = {'pid': 456, 'name': 'firefox', 'cmdline': ["firefox"]}
+        mock_proc.cmdline.reset_mock()
         with patch("psutil.process_iter", return_value=[mock_proc]):
             assert manager.is_chrome_running() is False
             assert manager.get_chrome_pid() is None
+        
+        # Command lines of non-Chrome processes are never read
+        mock_proc.cmdline.assert_not_called()
+    
+    def test_chrome_scan_cached(self, manager: ChromeManager):
+        """Test that a found Chrome process is reused for a short time."""
+        mock_proc = Mock()
+        mock_proc.info = {'name': 'chrome'}
+        mock_proc.cmdline.return_value = ["chrome", "--remote-debugging-port=9222"]
+        mock_proc.pid = 123
+        mock_proc.is_running.return_value = True
+        
+        with patch("psutil.process_iter", return_value=[mock_proc]) as mock_iter:
+            assert manager.is_chrome_running() is True
+            assert manager.get_chrome_pid() == 123
+            mock_iter.assert_called_once()
+            
+            # Expired entries are scanned again
+            manager._chrome_proc_ts -= 10
+            assert manager.is_chrome_running() is True
+            assert mock_iter.call_count == 2
+            
+            # A process that went away is dropped
+            mock_proc.is_running.side_effect = psutil.NoSuchProcess(123)
+            mock_iter.return_value = []
+            assert manager.is_chrome_running() is False
+            assert manager._chrome_proc is None
     
     @patch("psutil.Process")
     def test_get_memory_usage(self, mock_process_class, manager: ChromeManager):
@@ -65,18 +106,20 @@ class TestChromeManager:
         # Test when Chrome is running
         mock_proc = Mock()
         mock_proc.memory_info.return_value = Mock(rss=100 * 1024 * 1024)  # 100MB
-        mock_process_class.return_value = mock_proc
         
-        with patch.object(manager, "get_chrome_pid", return_value=123):
+        with patch.object(manager, "_scan_chrome", return_value=mock_proc) as mock_scan:
             assert manager.get_memory_usage() == 100.0
+            # One scan, no second lookup by pid
+            mock_scan.assert_called_once()
+            mock_process_class.assert_not_called()
         
         # Test when Chrome is not running
-        with patch.object(manager, "get_chrome_pid", return_value=None):
+        with patch.object(manager, "_scan_chrome", return_value=None):
             assert manager.get_memory_usage() == 0.0
         
         # Test when process doesn't exist
-        mock_process_class.side_effect = psutil.NoSuchProcess(123)
-        with patch.object(manager, "get_chrome_pid", return_value=123):
+        mock_proc.memory_info.side_effect = psutil.NoSuchProcess(123)
+        with patch.object(manager, "_scan_chrome", return_value=mock_proc):
             assert manager.get_memory_usage() == 0.0
     
     @pytest.mark.asyncio
@@ -123,7 +166,7 @@ class TestChromeManager:
         
         with patch("claude_sync.browser.manager.async_playwright", return_value=mock_async_pw):
             # Mock Chrome running
-            with patch.object(manager, "is_chrome_running", return_value=True):
+            with patch.object(manager, "_scan_chrome", return_value=Mock()):
                 browser = await manager.connect_existing()
                 
                 mock_pw.chromium.connect_over_cdp.assert_called_once_with(
@@ -132,7 +175,7 @@ class TestChromeManager:
                 assert browser == mock_context
             
             # Test when Chrome is not running
-            with patch.object(manager, "is_chrome_running", return_value=False):
+            with patch.object(manager, "_scan_chrome", return_value=None):
                 browser = await manager.connect_existing()
                 assert browser is None
     
@@ -151,6 +194,12 @@ class TestChromeManager:
             with patch.object(manager, "launch_persistent", return_value=mock_browser):
                 browser = await manager.get_or_create_browser()
                 assert browser == mock_browser
+        
+        # Test reusing the context this manager already holds
+        manager._browser = mock_browser
+        with patch.object(manager, "connect_existing") as mock_connect:
+            assert await manager.get_or_create_browser() is mock_browser
+            mock_connect.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_close(self, manager: ChromeManager):
@@ -168,6 +217,45 @@ class TestChromeManager:
         assert manager._browser is None
         assert manager._playwright is None
     
+    @pytest.mark.asyncio
+    async def test_shared_connection(self):
+        """Test that the shared connection starts the browser once."""
+        mock_browser = AsyncMock(spec=BrowserContext)
+        
+        with patch.object(ChromeManager, "get_or_create_browser", return_value=mock_browser) as mock_get:
+            with patch.object(ChromeManager, "close", AsyncMock()) as mock_close:
+                first, second = await asyncio.gather(
+                    get_shared_connection(), get_shared_connection()
+                )
+                
+                assert first is second
+                assert first.context is mock_browser
+                assert first.page_pool_size == BrowserConfig().max_concurrent_downloads
+                mock_get.assert_called_once()
+                
+                await shutdown_shared_connection()
+                mock_close.assert_called_once()
+                assert await get_shared_connection() is not first
+                await shutdown_shared_connection()
+    
+    @pytest.mark.asyncio
+    async def test_shared_connection_start_failure(self):
+        """Test that a failed browser start closes the manager and shares nothing."""
+        config = BrowserConfig(max_concurrent_downloads=2)
+        
+        with patch.object(ChromeManager, "get_or_create_browser", side_effect=RuntimeError("no chrome")):
+            with patch.object(ChromeManager, "close", AsyncMock()) as mock_close:
+                with pytest.raises(RuntimeError):
+                    await get_shared_connection(config)
+                mock_close.assert_called_once()
+        
+        mock_browser = AsyncMock(spec=BrowserContext)
+        with patch.object(ChromeManager, "get_or_create_browser", return_value=mock_browser):
+            with patch.object(ChromeManager, "close", AsyncMock()):
+                connection = await get_shared_connection(config)
+                assert connection.page_pool_size == 2
+                await shutdown_shared_connection()
+    
     def test_kill_chrome(self, manager: ChromeManager):
         """Test killing Chrome process."""
         mock_proc = Mock()
@@ -240,13 +328,82 @@ class TestChromeConnection:
         # Test when current page is closed
         mock_page.is_closed.return_value = True
         connection.context.pages = []  # No existing pages
-        new_page = AsyncMock()
+        new_page = AsyncMock(spec=Page)
         connection.context.new_page.return_value = new_page
         
         page3 = await connection.get_or_create_page()
         assert page3 == new_page
         connection.context.new_page.assert_called_once()
     
+    @pytest.mark.asyncio
+    async def test_resource_filter(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test that heavy resources are blocked once per page we drive."""
+        await connection.get_or_create_page()
+        connection._current_page = None
+        await connection.get_or_create_page()
+        
+        session = connection.context.new_cdp_session.return_value
+        connection.context.new_cdp_session.assert_called_once_with(mock_page)
+        session.send.assert_any_call("Network.setBlockedURLs", {"urls": list(BLOCKED_URL_PATTERNS)})
+        mock_page.on.assert_called_once_with("response", connection._capture_api_response)
+        # No request interception, so the HTTP cache stays enabled
+        mock_page.route.assert_not_called()
+        connection.context.route.assert_not_called()
+        connection.context.on.assert_not_called()
+        
+        # close() unhooks the page before closing it
+        await connection.close()
+        session.send.assert_called_with("Network.setBlockedURLs", {"urls": []})
+        session.detach.assert_called_once()
+        mock_page.remove_listener.assert_called_once_with("response", connection._capture_api_response)
+    
+    @pytest.mark.asyncio
+    async def test_api_capture(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test using captured projects/docs API payloads instead of the DOM."""
+        def response(url, payload):
+            resp = AsyncMock()
+            resp.url = url
+            resp.json.return_value = payload
+            return resp
+        
+        org = "https://claude.ai/api/organizations/org-1"
+        await connection._capture_api_response(response(f"{org}/projects?limit=2", [
+            {"uuid": "p1", "name": "DNI", "description": "EU-only MLETR"},
+        ]))
+        await connection._capture_api_response(response(f"{org}/projects?offset=1", [
+            {"uuid": "p2", "name": "DLPoS", "description": ""},
+        ]))
+        await connection._capture_api_response(response(f"{org}/projects/p1/docs", [
+            {"uuid": "d1", "file_name": "Invoice valuation.md", "content": "body"},
+        ]))
+        await connection._capture_api_response(response(f"{org}/chat_conversations", [{"uuid": "c1"}]))
+        
+        mock_page.url = "https://claude.ai/projects"
+        mock_page.query_selector.return_value = None
+        projects = await connection.extract_projects()
+        
+        assert [(p.id, p.name, p.description) for p in projects] == [
+            ("p1", "DNI", "EU-only MLETR"),
+            ("p2", "DLPoS", None),
+        ]
+        mock_page.evaluate.assert_not_called()
+        
+        mock_page.url = "https://claude.ai/project/p1"
+        mock_page.evaluate.return_value = [
+            {"name": "Invoice valuation", "texts": ["489 lines", "text"]},
+            {"name": "Report", "texts": ["pdf"]},
+        ]
+        files = await connection.extract_knowledge_files()
+        
+        assert [(f.name, f.content) for f in files] == [
+            ("Invoice valuation", "body"),
+            ("Report", None),
+        ]
+        
+        # Stale payloads are ignored
+        with patch("claude_sync.browser.connection.time.monotonic", return_value=time.monotonic() + 3600):
+            assert connection._get_api_payload("projects") is None
+    
     @pytest.mark.asyncio
     async def test_navigate(self, connection: ChromeConnection, mock_page: AsyncMock):
         """Test navigating to URL."""
@@ -255,9 +412,62 @@ class TestChromeConnection:
         url = "https://claude.ai/projects"
         await connection.navigate(url)
         
-        mock_page.goto.assert_called_once_with(url, wait_until="domcontentloaded", timeout=60000)
+        mock_page.goto.assert_called_once_with(url, wait_until="commit", timeout=15000)
         assert connection._current_page == mock_page
     
+    @pytest.mark.asyncio
+    async def test_navigate_captures_projects_api(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test that loading the projects page waits for the projects API."""
+        mock_page.is_closed.return_value = False
+        response = AsyncMock()
+        response.url = "https://claude.ai/api/organizations/org/projects"
+        response.json.return_value = [{"uuid": "abc", "name": "DNI"}]
+        response_info = MagicMock()
+        response_info.value = asyncio.get_running_loop().create_future()
+        response_info.value.set_result(response)
+        mock_page.expect_response.return_value.__aenter__.return_value = response_info
+        
+        await connection.navigate("https://claude.ai/projects")
+        
+        mock_page.goto.assert_called_once()
+        predicate = mock_page.expect_response.call_args.args[0]
+        assert predicate(response)
+        assert connection._get_api_payload("projects") == [{"uuid": "abc", "name": "DNI"}]
+        
+        # Project pages wait for their docs instead
+        mock_page.expect_response.reset_mock()
+        await connection.navigate("https://claude.ai/project/abc")
+        predicate = mock_page.expect_response.call_args.args[0]
+        assert not predicate(response)
+        docs_response = AsyncMock()
+        docs_response.url = "https://claude.ai/api/organizations/org/projects/abc/docs"
+        assert predicate(docs_response)
+        
+        # Other pages don't wait for either
+        mock_page.expect_response.reset_mock()
+        await connection.navigate("https://claude.ai/new")
+        mock_page.expect_response.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_wait_for_knowledge_files(self, connection: ChromeConnection, mock_page: AsyncMock, caplog):
+        """Test waiting for every listed file, or the empty-project message."""
+        mock_page.url = "https://claude.ai/project/abc"
+        
+        # Without the docs API, any thumbnail or the empty message will do
+        await connection.wait_for_knowledge_files(timeout=8000)
+        mock_page.wait_for_function.assert_called_with(KNOWLEDGE_READY_JS, arg=None, timeout=8000)
+        
+        # With it, every listed file must have rendered
+        connection._api_cache["docs:abc"] = (time.monotonic(), [{"file_name": "a"}, {"file_name": "b"}])
+        await connection.wait_for_knowledge_files()
+        mock_page.wait_for_function.assert_called_with(KNOWLEDGE_READY_JS, arg=2, timeout=8000)
+        
+        # A timeout is expected for slow pages and is not a warning
+        mock_page.wait_for_function.side_effect = Exception("Timeout")
+        with caplog.at_level("DEBUG", logger="claude_sync.browser.connection"):
+            await connection.wait_for_knowledge_files()
+        assert [r.levelname for r in caplog.records] == ["DEBUG"]
+    
     @pytest.mark.asyncio
     async def test_get_page_content(self, connection: ChromeConnection, mock_page: AsyncMock):
         """Test getting page content."""
@@ -299,11 +509,26 @@ class TestChromeConnection:
         
         assert await connection.is_logged_in() is True
         
-        # Test when not logged in (has login button)
+        # Logged-in-only routes skip navigation entirely
+        mock_page.url = "https://claude.ai/new"
+        assert await connection.is_logged_in() is True
+        mock_page.goto.assert_not_called()
+        
+        # Test when redirected to login: no need to wait for the page
         mock_page.url = "https://claude.ai/login"
+        
+        assert await connection.is_logged_in() is False
+        mock_page.wait_for_load_state.assert_not_called()
+        
+        # Test when not logged in (has login button)
+        mock_page.url = "https://claude.ai"
         mock_locator.count.return_value = 1  # Has login button
         
         assert await connection.is_logged_in() is False
+        
+        # Readiness is event-driven rather than a fixed sleep
+        mock_page.wait_for_load_state.assert_called_with("load", timeout=3000)
+        mock_page.wait_for_timeout.assert_not_called()
     
     @pytest.mark.asyncio
     async def test_extract_projects(self, connection: ChromeConnection, mock_page: AsyncMock):
@@ -319,6 +544,56 @@ class TestChromeConnection:
         assert projects[0].name == "DNI"
         assert projects[0].description == "EU-only MLETR"
     
+    @pytest.mark.asyncio
+    async def test_extract_projects_from_projection(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test extracting projects via in-page projection without page.content()."""
+        mock_page.is_closed.return_value = False
+        mock_page.url = "https://claude.ai/projects"
+        mock_page.query_selector.return_value = None
+        mock_page.evaluate.return_value = [
+            {"href": "/project/abc", "name": "DNI", "description": "EU-only MLETR"},
+            {"href": "/project/def", "name": "DLPoS", "description": "Updated 2 days ago"},
+        ]
+        
+        projects = await connection.extract_projects()
+        
+        assert [p.name for p in projects] == ["DNI", "DLPoS"]
+        assert projects[0].description == "EU-only MLETR"
+        assert projects[1].description is None
+        mock_page.content.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_extract_projects_html_fallback(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test that a failed projection falls back to one page.content() call."""
+        from tests.fixtures.html_samples import PROJECTS_PAGE_HTML
+        
+        mock_page.is_closed.return_value = False
+        mock_page.url = "https://claude.ai/projects"
+        mock_page.query_selector.return_value = None
+        mock_page.evaluate.side_effect = Exception("Execution context was destroyed")
+        mock_page.content.return_value = PROJECTS_PAGE_HTML
+        
+        projects = await connection.extract_projects()
+        
+        assert len(projects) == 4
+        mock_page.content.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_extract_projects_scoped_html(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test that the HTML fallback serializes only the list container."""
+        from tests.fixtures.html_samples import PROJECTS_PAGE_HTML
+        
+        mock_page.is_closed.return_value = False
+        mock_page.url = "https://claude.ai/projects"
+        mock_page.query_selector.return_value = None
+        mock_page.evaluate.side_effect = [None, PROJECTS_PAGE_HTML]
+        
+        projects = await connection.extract_projects()
+        
+        assert len(projects) == 4
+        assert mock_page.evaluate.call_args.args[1] == '[data-testid="projects-list"], main'
+        mock_page.content.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_extract_knowledge_files(self, connection: ChromeConnection, mock_page: AsyncMock):
         """Test extracting knowledge files from current page."""
@@ -333,6 +608,24 @@ class TestChromeConnection:
         assert files[0].name == "Invoice valuation"
         assert files[0].lines == 489
     
+    @pytest.mark.asyncio
+    async def test_extract_knowledge_files_from_projection(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test extracting knowledge files via in-page projection."""
+        mock_page.is_closed.return_value = False
+        mock_page.evaluate.return_value = [
+            {"name": "Invoice valuation", "texts": ["489 lines", "text"]},
+            {"name": "Report", "texts": ["pdf"]},
+            {"name": "", "texts": ["10 lines"]},
+        ]
+        
+        files = await connection.extract_knowledge_files()
+        
+        assert [(f.name, f.file_type, f.lines) for f in files] == [
+            ("Invoice valuation", "text", 489),
+            ("Report", "pdf", None),
+        ]
+        mock_page.content.assert_not_called()
+    
     @pytest.mark.asyncio
     async def test_download_file_content(self, connection: ChromeConnection, mock_page: AsyncMock):
         """Test downloading file content."""
@@ -369,28 +662,229 @@ class TestChromeConnection:
         
         mock_page.expect_download = MagicMock(return_value=DownloadContext())
         
-        with patch("aiofiles.open", create=True) as mock_open:
-            mock_file = AsyncMock()
-            mock_file.read.return_value = "File content"
-            mock_open.return_value.__aenter__.return_value = mock_file
-            
-            with patch("pathlib.Path.unlink"):
-                content = await connection.download_file_content("test.txt")
-            
-            # Our new implementation looks for thumbnails, not locators
+        with patch("pathlib.Path.unlink"):
+            content = await connection.download_file_content("test.txt")
+        
+        # Our new implementation looks for thumbnails, not locators
         # Since we're not mocking the thumbnail structure, it should return None
         assert content is None
     
+    @pytest.mark.asyncio
+    async def test_download_file_content_by_index(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test locating a file by name and reading the modal in one evaluate each."""
+        mock_page.is_closed.return_value = False
+        mock_page.evaluate.side_effect = [
+            ["first.txt", "second.txt"],
+            {"content": "  file body  ", "selector": "pre"},
+        ]
+        thumbnails = MagicMock()
+        button = MagicMock()
+        button.first.click = AsyncMock()
+        thumbnails.nth.return_value.locator.return_value = button
+        mock_page.locator.return_value = thumbnails
+        
+        with patch.object(connection, "_close_modal", AsyncMock()) as mock_close:
+            content = await connection.download_file_content("second.txt")
+        
+        assert content == "file body"
+        thumbnails.nth.assert_called_once_with(1)
+        button.first.click.assert_called_once()
+        mock_close.assert_called_once()
+        mock_page.wait_for_timeout.assert_not_called()
+        
+        # Unknown file names never click anything
+        mock_page.evaluate.side_effect = [["first.txt"]]
+        assert await connection.download_file_content("missing.txt") is None
+        button.first.click.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_downloads_share_pool(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test concurrent downloads run across a pool of pages."""
+        mock_page.url = "https://claude.ai/project/123"
+        extra_page = AsyncMock(spec=Page)
+        connection.context.new_page.return_value = extra_page
+        
+        async def fake_download(page, file_name):
+            await asyncio.sleep(0)
+            return f"{file_name} content"
+        
+        connection.page_pool_size = 2
+        
+        with patch.object(connection, "_download_from_page", side_effect=fake_download) as mock_download:
+            results = await asyncio.gather(
+                *(connection.download_file_content(name) for name in ["a", "b", "c"])
+            )
+        
+        assert results == ["a content", "b content", "c content"]
+        connection.context.new_page.assert_called_once()
+        extra_page.goto.assert_called_once_with(mock_page.url, wait_until="domcontentloaded")
+        used_pages = {call.args[0] for call in mock_download.call_args_list}
+        assert used_pages == {mock_page, extra_page}
+        
+        # Extra pages live until the connection is closed
+        extra_page.close.assert_not_called()
+        extra_page.is_closed.return_value = False
+        await connection.close()
+        extra_page.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_page_pool_backs_off_after_failed_page(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test a failed extra page pauses pool growth without shrinking the pool size."""
+        mock_page.url = "https://claude.ai/project/123"
+        broken_page = AsyncMock(spec=Page)
+        broken_page.goto.side_effect = Exception("Timeout")
+        connection.context.new_page.return_value = broken_page
+
+        first = await connection.acquire_page()
+        waiter = asyncio.ensure_future(connection.acquire_page())
+        await asyncio.sleep(0)
+        connection.release_page(first)
+        assert await waiter is mock_page
+        broken_page.close.assert_called_once()
+        assert connection.page_pool_size == 4
+
+        # While backing off, a busy pool waits instead of opening pages
+        connection.context.new_page.reset_mock()
+        waiter = asyncio.ensure_future(connection.acquire_page())
+        await asyncio.sleep(0)
+        connection.context.new_page.assert_not_called()
+        connection.release_page(mock_page)
+        assert await waiter is mock_page
+
+        # After the back-off, the pool grows again
+        connection._pool_grow_after = 0.0
+        healthy_page = AsyncMock(spec=Page)
+        connection.context.new_page.return_value = healthy_page
+        assert await connection.acquire_page() is healthy_page
+
+    @pytest.mark.asyncio
+    async def test_page_pool_drops_idle_page_that_fails_to_load(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test an idle page that can't show the current project is closed and skipped."""
+        mock_page.url = "https://claude.ai/project/123"
+        extra_page = AsyncMock(spec=Page)
+        connection.context.new_page.return_value = extra_page
+        connection.page_pool_size = 2
+
+        first = await connection.acquire_page()
+        second = await connection.acquire_page()
+        assert second is extra_page
+        connection.release_page(second)
+        connection.release_page(first)
+
+        # The next project fails to load on the extra page
+        mock_page.url = "https://claude.ai/project/456"
+        extra_page.goto.side_effect = Exception("Timeout")
+
+        assert await connection.acquire_page() is mock_page
+        extra_page.close.assert_called_once()
+        assert connection._pool_count == 1
+        assert extra_page not in connection._extra_pages
+
+    @pytest.mark.asyncio
+    async def test_download_file_content_without_page(self, connection: ChromeConnection):
+        """Test that a download returns None when no pool page can be had."""
+        with patch.object(connection, "acquire_page", side_effect=Exception("Target closed")):
+            assert await connection.download_file_content("test.txt") is None
+
+    @pytest.mark.asyncio
+    async def test_page_pool_reuses_idle_pages(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test serial downloads share one page instead of opening new ones."""
+        first = await connection.acquire_page()
+        connection.release_page(first)
+        second = await connection.acquire_page()
+        connection.release_page(second)
+        
+        assert first is mock_page
+        assert second is mock_page
+        connection.context.new_page.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_close_modal(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test closing a modal with one evaluate and an Escape fallback."""
+        mock_page.keyboard = AsyncMock()
+        
+        # A close button was clicked in-page
+        mock_page.evaluate.return_value = True
+        await connection._close_modal(mock_page)
+        mock_page.evaluate.assert_called_once()
+        mock_page.keyboard.press.assert_not_called()
+        mock_page.wait_for_selector.assert_called_with(
+            DIALOG_SELECTOR, state="detached", timeout=2000
+        )
+        
+        # No close button: fall back to Escape
+        mock_page.evaluate.return_value = False
+        await connection._close_modal(mock_page)
+        mock_page.keyboard.press.assert_called_once_with('Escape')
+        mock_page.query_selector.assert_not_called()
+        
+        # Escape is retried only while the dialog stays open
+        mock_page.keyboard.press.reset_mock()
+        mock_page.wait_for_selector.side_effect = Exception("Timeout")
+        mock_page.evaluate.side_effect = [False, True, True, True]
+        await connection._close_modal(mock_page)
+        assert mock_page.keyboard.press.call_count == 3
+        
+        mock_page.keyboard.press.reset_mock()
+        mock_page.evaluate.side_effect = [False, False]
+        await connection._close_modal(mock_page)
+        mock_page.keyboard.press.assert_called_once_with('Escape')
+        mock_page.wait_for_selector.side_effect = None
+        mock_page.evaluate.side_effect = None
+        
+        # No dialog open: nothing to press or wait for
+        mock_page.wait_for_selector.reset_mock()
+        mock_page.evaluate.return_value = None
+        await connection._close_modal(mock_page)
+        mock_page.keyboard.press.assert_called_once()
+        mock_page.wait_for_selector.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_is_modal_open(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test that the modal check is a single evaluate."""
+        mock_page.is_closed.return_value = False
+        mock_page.evaluate.return_value = True
+        
+        assert await connection.is_modal_open() is True
+        mock_page.evaluate.assert_called_once()
+        mock_page.locator.assert_not_called()
+        
+        mock_page.evaluate.return_value = False
+        assert await connection.is_modal_open(mock_page) is False
+
+    @pytest.mark.asyncio
+    async def test_close_modal_public(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test that close_modal cleans up the given page, or the current one."""
+        with patch.object(connection, "_close_modal") as mock_close:
+            await connection.close_modal()
+            mock_close.assert_called_once_with(mock_page)
+
+            other_page = AsyncMock(spec=Page)
+            await connection.close_modal(other_page)
+            mock_close.assert_called_with(other_page)
+    
     @pytest.mark.asyncio
     async def test_close(self, connection: ChromeConnection, mock_page: AsyncMock):
-        """Test closing connection."""
+        """Test closing connection closes a page it opened."""
         mock_page.is_closed.return_value = False
-        connection._current_page = mock_page
+        connection.context.pages = []
+        await connection.get_or_create_page()
         
         await connection.close()
         
         mock_page.close.assert_called_once()
         assert connection._current_page is None
+    
+    @pytest.mark.asyncio
+    async def test_close_leaves_existing_tab_open(self, connection: ChromeConnection, mock_page: AsyncMock):
+        """Test closing connection leaves a page it found in the context open."""
+        mock_page.is_closed.return_value = False
+        await connection.get_or_create_page()
+        
+        await connection.close()
+        
+        mock_page.close.assert_not_called()
+        assert connection._current_page is None
 
 
 class TestBrowserConfig:
@@ -1,4 +1,8 @@
 """Tests for HTML extractors."""
+import subprocess
+import sys
+from unittest.mock import patch
+
 import pytest
 from bs4 import BeautifulSoup
 
@@ -99,6 +103,49 @@ class TestProjectExtractor:
         projects = extractor.extract_from_html(html)
         assert len(projects) == 1
         assert projects[0].url == "https://claude.ai/project/456"
+    
+    def test_extract_from_records(self):
+        """Test building projects from in-page projection records."""
+        extractor = ProjectExtractor()
+        records = [
+            {"href": "/project/123", "name": "Test Project", "description": "desc"},
+            {"href": "/project/456", "name": "Other", "description": "Updated 3 days ago"},
+            {"href": "/project/789", "name": "", "description": None},
+            {"href": "/invalid/url", "name": "Bad", "description": None},
+        ]
+        
+        projects = extractor.extract_from_records(records)
+        
+        assert len(projects) == 2
+        assert projects[0].id == "123"
+        assert projects[0].url == "https://claude.ai/project/123"
+        assert projects[0].description == "desc"
+        assert projects[1].description is None
+    
+    def test_extract_from_api(self):
+        """Test building projects from projects API records."""
+        extractor = ProjectExtractor()
+        projects = extractor.extract_from_api([
+            {"uuid": "abc", "name": "DNI", "description": "EU-only MLETR"},
+            {"uuid": "def", "name": "DLPoS", "description": ""},
+            {"uuid": "ghi"},
+        ])
+        
+        assert len(projects) == 2
+        assert projects[0].url == "https://claude.ai/project/abc"
+        assert projects[0].description == "EU-only MLETR"
+        assert projects[1].description is None
+    
+    def test_records_match_html_extraction(self):
+        """Test that record and HTML extraction agree on the same cards."""
+        extractor = ProjectExtractor()
+        from_html = extractor.extract_from_html(PROJECTS_PAGE_HTML)
+        records = [
+            {"href": f"/project/{p.id}", "name": p.name, "description": p.description}
+            for p in from_html
+        ]
+        
+        assert extractor.extract_from_records(records) == from_html
 
 
 class TestKnowledgeExtractor:
@@ -132,6 +179,19 @@ class TestKnowledgeExtractor:
         assert pdf_files[0].name == "Trade Finance Report 2024"
         assert pdf_files[0].lines is None  # PDFs don't have line counts
     
+    def test_extract_from_html_cached(self):
+        """Test that unchanged HTML is not parsed again."""
+        extractor = KnowledgeExtractor()
+        files = extractor.extract_from_html(DNI_PROJECT_PAGE_HTML)
+        
+        with patch.object(extractor, "extract_from_soup") as mock_extract:
+            again = extractor.extract_from_html(DNI_PROJECT_PAGE_HTML)
+            mock_extract.assert_not_called()
+        
+        assert again == files
+        # Callers get their own copies
+        assert again[0] is not files[0]
+    
     def test_extract_from_soup(self):
         """Test extracting from BeautifulSoup object."""
         extractor = KnowledgeExtractor()
@@ -141,6 +201,26 @@ class TestKnowledgeExtractor:
         assert len(files) == 7
         assert all(isinstance(f, KnowledgeFile) for f in files)
     
+    def test_attach_api_content(self):
+        """Test filling file content from docs API records."""
+        extractor = KnowledgeExtractor()
+        files = [
+            KnowledgeFile(name="notes.txt", file_type="text"),
+            KnowledgeFile(name="Invoice valuation", file_type="text", lines=2),
+            KnowledgeFile(name="Report", file_type="pdf"),
+        ]
+        docs = [
+            {"file_name": "notes.txt", "content": "a"},
+            {"file_name": "Invoice valuation.md", "content": "b\nc"},
+            {"file_name": "broken"},
+        ]
+        
+        result = extractor.attach_api_content(files, docs)
+        
+        assert [f.content for f in result] == ["a", "b\nc", None]
+        assert result[1].lines == 2
+        assert files[0].content is None  # originals untouched
+    
     def test_extract_empty_project(self):
         """Test extracting from project with no files."""
         extractor = KnowledgeExtractor()
@@ -204,4 +284,27 @@ class TestKnowledgeExtractor:
         files = extractor.extract_from_html(html)
         
         # Should handle gracefully and extract what it can
-        assert len(files) >= 0  # Depends on implementation
\ No newline at end of file
+        assert len(files) >= 0  # Depends on implementation
+    
+    def test_unvalidated_records_still_rejected(self):
+        """Test that thumbnails the model would reject are still skipped."""
+        extractor = KnowledgeExtractor()
+        files = extractor.extract_from_records([
+            {"name": "untyped", "texts": []},
+            {"name": "negative", "texts": ["-3 lines"]},
+            {"name": "notes.txt", "texts": ["12 lines"]},
+        ])
+        
+        assert files == [KnowledgeFile(name="notes.txt", file_type="text", lines=12)]
+
+
+class TestExtractorImports:
+    """Test extractor import cost."""
+    
+    def test_import_without_browser_stack(self):
+        """Test that importing the extractors does not load Playwright or psutil."""
+        code = (
+            "import sys, claude_sync.extractors; "
+            "sys.exit(int('playwright' in sys.modules or 'psutil' in sys.modules))"
+        )
+        assert subprocess.run([sys.executable, "-c", code]).returncode == 0
\ No newline at end of file
@@ -98,7 +98,25 @@ class TestSyncOrchestrator:
                 assert result["success"] is False
                 assert "Not logged in" in result["error"]
                 mock_manager.close.assert_called_once()
-    
+
+    @pytest.mark.asyncio
+    async def test_sync_all_releases_browser_if_connection_close_fails(self, orchestrator):
+        """Test that a failing connection close still shuts down the manager."""
+        with patch('claude_sync.sync.orchestrator.ChromeManager') as mock_manager_class:
+            mock_manager = AsyncMock()
+            mock_manager_class.return_value = mock_manager
+
+            with patch('claude_sync.sync.orchestrator.ChromeConnection') as mock_conn_class:
+                mock_connection = AsyncMock()
+                mock_conn_class.return_value = mock_connection
+                mock_connection.is_logged_in.return_value = False
+                mock_connection.close.side_effect = Exception("Target closed")
+
+                with pytest.raises(Exception, match="Target closed"):
+                    await orchestrator.sync_all()
+
+                mock_manager.close.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_sync_all_success(self, orchestrator, sample_projects, sample_files):
         """Test successful sync of all projects."""
@@ -131,10 +149,24 @@ class TestSyncOrchestrator:
                 mock_connection.navigate.assert_any_call("https://claude.ai/project/1", timeout=90000)
                 mock_connection.navigate.assert_any_call("https://claude.ai/project/2", timeout=90000)
                 
+                # Pages are awaited by content, not fixed sleeps
+                mock_connection.wait_for_selector.assert_any_call('a[href*="/project/"]', timeout=10000)
+                mock_connection.wait_for_knowledge_files.assert_any_call(timeout=8000)
+                
                 # Verify storage was updated
                 sync_state = orchestrator.storage.get_sync_state()
                 assert sync_state["projects_synced"] == ["Project 1", "Project 2"]
                 assert sync_state["total_files"] == 4
+                
+                # The page pool matches the download limit
+                mock_conn_class.assert_called_once_with(
+                    mock_browser,
+                    page_pool_size=orchestrator.browser_config.max_concurrent_downloads
+                )
+                
+                # Pool pages are closed before the browser is released
+                mock_connection.close.assert_awaited_once()
+                mock_manager.close.assert_awaited_once()
     
     @pytest.mark.asyncio
     async def test_sync_all_with_filter(self, orchestrator, sample_projects, sample_files):
@@ -230,6 +262,56 @@ class TestSyncOrchestrator:
                     assert len(result["errors"]) == 1  # One error recorded
                     assert "file_sync" in result["errors"][0]["type"]
     
+    @pytest.mark.asyncio
+    async def test_prefetched_content_skips_download(self, orchestrator, sample_projects):
+        """Test that files with captured content are not downloaded again."""
+        with patch('claude_sync.sync.orchestrator.ChromeManager') as mock_manager_class:
+            mock_manager = AsyncMock()
+            mock_connection = AsyncMock()
+            mock_manager_class.return_value = mock_manager
+            
+            with patch('claude_sync.sync.orchestrator.ChromeConnection') as mock_conn_class:
+                mock_conn_class.return_value = mock_connection
+                mock_connection.is_logged_in.return_value = True
+                mock_connection.extract_projects.return_value = sample_projects[:1]
+                mock_connection.extract_knowledge_files.return_value = [
+                    KnowledgeFile(name="file1.txt", file_type="text", content="from api"),
+                ]
+                
+                result = await orchestrator.sync_all()
+                
+                assert result["files_synced"] == 1
+                mock_connection.download_file_content.assert_not_called()
+                knowledge_dir = orchestrator.storage.get_project_path(sample_projects[0]) / "knowledge"
+                assert (knowledge_dir / "file1.txt.text").read_text() == "from api"
+    
+    @pytest.mark.asyncio
+    async def test_alternative_download_clicks_in_one_evaluate(self, orchestrator, sample_files):
+        """Test that the fallback locates and clicks the thumbnail in one evaluate."""
+        mock_page = AsyncMock()
+        mock_connection = AsyncMock()
+        mock_connection.acquire_page.return_value = mock_page
+        mock_connection.release_page = Mock()
+        
+        mock_page.evaluate.return_value = True
+        await orchestrator._alternative_download(mock_connection, sample_files[0])
+        mock_page.evaluate.assert_called_once()
+        assert mock_page.evaluate.call_args.args[1] == "file1.txt"
+        mock_page.wait_for_selector.assert_called_once()
+        mock_page.query_selector_all.assert_not_called()
+        
+        # Unknown files never wait for a modal
+        mock_page.evaluate.return_value = False
+        assert await orchestrator._alternative_download(mock_connection, sample_files[1]) is None
+        mock_page.wait_for_selector.assert_called_once()
+        
+        # Each attempt runs on a pooled page and leaves it closed and returned
+        mock_connection.get_or_create_page.assert_not_called()
+        assert mock_connection.close_modal.call_count == 2
+        mock_connection.close_modal.assert_called_with(mock_page)
+        assert mock_connection.release_page.call_count == 2
+        mock_connection.release_page.assert_called_with(mock_page)
+    
     @pytest.mark.asyncio
     async def test_progress_tracking(self, orchestrator, sample_projects, sample_files):
         """Test that progress is tracked correctly."""
@@ -363,4 +445,157 @@ class TestSyncOrchestrator:
                 
                 # Verify file was saved
                 files = list(knowledge_dir.glob("*.text"))
-                assert len(files) == 1
\ No newline at end of file
+                assert len(files) == 1
+    
+    def test_progress_callback_throttled(self, tmp_path):
+        """Test that bursts of progress updates are throttled but flushes always fire."""
+        calls = []
+        orchestrator = SyncOrchestrator(tmp_path, progress_callback=calls.append)
+        
+        for _ in range(100):
+            orchestrator._update_progress()
+        assert len(calls) == 1
+        
+        orchestrator._flush_progress()
+        assert len(calls) == 2
+    
+    @pytest.mark.asyncio
+    async def test_sync_project_bounds_concurrent_downloads(self, tmp_path, sample_projects):
+        """Test that file downloads run in parallel up to the configured limit."""
+        config = BrowserConfig(max_concurrent_downloads=2)
+        orchestrator = SyncOrchestrator(tmp_path, browser_config=config)
+        files = [KnowledgeFile(name=f"file{i}.txt", file_type="text") for i in range(6)]
+        
+        connection = AsyncMock()
+        connection.extract_knowledge_files.return_value = files
+        
+        active = 0
+        peak = 0
+        
+        async def fake_sync(connection, project, file):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            if file.name == "file5.txt":
+                raise RuntimeError("boom")
+        
+        with patch.object(orchestrator, '_sync_knowledge_file', side_effect=fake_sync):
+            await orchestrator._sync_project(connection, sample_projects[0])
+        
+        assert peak == 2
+        assert orchestrator.progress.completed_projects == 1
+        assert orchestrator.progress.errors[0]["file"] == "file5.txt"
+    
+    @pytest.mark.asyncio
+    async def test_project_status_read_once_per_project(self, orchestrator, sample_projects, sample_files):
+        """Test that project.json is read once per project, not once per file."""
+        connection = AsyncMock()
+        connection.extract_knowledge_files.return_value = sample_files
+        connection.download_file_content.return_value = "test content"
+        
+        with patch.object(
+            orchestrator.storage, 'get_project_sync_status',
+            wraps=orchestrator.storage.get_project_sync_status
+        ) as status_mock:
+            await orchestrator._sync_project(connection, sample_projects[0])
+        
+        assert len(sample_files) > 1
+        assert status_mock.call_count == 1
+        assert orchestrator.progress.completed_files == len(sample_files)
+    
+    @pytest.mark.asyncio
+    async def test_unchanged_files_skipped_on_resync(self, orchestrator, sample_projects, sample_files):
+        """Test that a re-sync with identical content writes nothing new."""
+        connection = AsyncMock()
+        connection.extract_knowledge_files.return_value = sample_files
+        connection.download_file_content.return_value = "test content"
+        
+        await orchestrator._sync_project(connection, sample_projects[0])
+        
+        with patch.object(
+            orchestrator.storage, 'save_knowledge_file',
+            wraps=orchestrator.storage.save_knowledge_file
+        ) as save_mock:
+            await orchestrator._sync_project(connection, sample_projects[0])
+            assert save_mock.call_count == 0
+            
+            connection.download_file_content.return_value = "new content"
+            await orchestrator._sync_project(connection, sample_projects[0])
+            assert save_mock.call_count == len(sample_files)
+        
+        status = orchestrator.storage.get_project_sync_status(sample_projects[0])
+        assert set(status["synced_files"]) == {f.name for f in sample_files}
+
+    @pytest.mark.asyncio
+    async def test_deleted_file_restored_on_resync(self, orchestrator, sample_projects, sample_files):
+        """Test that an unchanged file is written again if its local copy is gone."""
+        project = sample_projects[0]
+        connection = AsyncMock()
+        connection.extract_knowledge_files.return_value = sample_files
+        connection.download_file_content.return_value = "test content"
+
+        await orchestrator._sync_project(connection, project)
+
+        project_path = orchestrator.storage.get_project_path(project)
+        record = orchestrator.storage.get_project_sync_status(project)["synced_files"][sample_files[0].name]
+        saved = project_path / record["path"]
+        saved.unlink()
+
+        await orchestrator._sync_project(connection, project)
+
+        assert saved.read_text() == "test content"
+
+    @pytest.mark.asyncio
+    async def test_changed_file_replaces_previous_copy(self, orchestrator, sample_projects, sample_files):
+        """Test that content changing across re-syncs keeps one copy per file."""
+        project = sample_projects[0]
+        connection = AsyncMock()
+        connection.extract_knowledge_files.return_value = sample_files
+
+        for version in ("v1", "v2", "v3"):
+            connection.download_file_content.return_value = version
+            await orchestrator._sync_project(connection, project)
+
+        knowledge_dir = orchestrator.storage.get_project_path(project) / "knowledge"
+        saved = sorted(knowledge_dir.iterdir())
+        assert len(saved) == len(sample_files)
+        assert all(path.read_text() == "v3" for path in saved)
+
+    @pytest.mark.asyncio
+    async def test_sync_project_logs_one_info_summary(self, orchestrator, sample_projects, sample_files, caplog):
+        """Test that per-file lines stay at DEBUG and the project gets one summary."""
+        connection = AsyncMock()
+        connection.extract_knowledge_files.return_value = sample_files
+        connection.download_file_content.return_value = "test content"
+        
+        with caplog.at_level("INFO", logger="claude_sync.sync"):
+            await orchestrator._sync_project(connection, sample_projects[0])
+        
+        messages = [r.getMessage() for r in caplog.records]
+        assert not any(m.startswith(("Downloading:", "Saved:")) for m in messages)
+        expected_bytes = len("test content") * len(sample_files)
+        assert (
+            f"Project {sample_projects[0].name}: {len(sample_files)}/{len(sample_files)} files, "
+            f"{expected_bytes} bytes saved"
+        ) in messages
+    
+    @pytest.mark.asyncio
+    async def test_content_digest_offloads_large_content(self, orchestrator, sample_files):
+        """Test that large content is hashed in an executor with the same result."""
+        from claude_sync.sync.orchestrator import HASH_OFFLOAD_THRESHOLD
+        
+        file = sample_files[0]
+        small = "x" * 10
+        large = "x" * HASH_OFFLOAD_THRESHOLD
+        loop = asyncio.get_running_loop()
+        
+        with patch.object(loop, 'run_in_executor', wraps=loop.run_in_executor) as executor_mock:
+            small_digest = await orchestrator._content_digest(small)
+            assert executor_mock.call_count == 0
+            large_digest = await orchestrator._content_digest(large)
+            assert executor_mock.call_count == 1
+        
+        assert small_digest == file.model_copy(update={"content": small}).calculate_content_hash()
+        assert large_digest == file.model_copy(update={"content": large}).calculate_content_hash()
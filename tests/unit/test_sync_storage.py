@@ -5,6 +5,7 @@ from pathlib import Path
 from datetime import datetime
 from unittest.mock import patch, MagicMock
 
+from claude_sync.sync import storage as storage_module
 from claude_sync.sync.storage import LocalStorage
 from claude_sync.models import Project, KnowledgeFile
 
@@ -89,7 +90,20 @@ class TestLocalStorage:
         
         with open(saved_path) as f:
             assert f.read() == content
-    
+
+    def test_save_knowledge_file_leaves_no_temp_file(self, temp_storage, sample_project, sample_file):
+        """Test that the atomic write cleans up its temp file, even on failure."""
+        temp_storage.save_project_metadata(sample_project)
+        saved_path = temp_storage.save_knowledge_file(sample_project, sample_file, "héllo")
+
+        assert saved_path.read_bytes() == "héllo".encode("utf-8")
+        assert [p.name for p in saved_path.parent.iterdir()] == [saved_path.name]
+
+        with patch("claude_sync.sync.storage.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                temp_storage.save_knowledge_file(sample_project, sample_file, "again")
+        assert [p.name for p in saved_path.parent.iterdir()] == [saved_path.name]
+
     def test_save_knowledge_file_handles_duplicates(self, temp_storage, sample_project, sample_file):
         """Test handling duplicate filenames."""
         content1 = "First file"
@@ -108,7 +122,32 @@ class TestLocalStorage:
         assert path1.exists()
         assert path2.exists()
         assert path2.name == "test.txt_1.text"
-    
+
+    def test_save_knowledge_file_picks_next_free_suffix(self, temp_storage, sample_project, sample_file):
+        """Test that repeated duplicates get increasing suffixes."""
+        temp_storage.save_project_metadata(sample_project)
+
+        names = [
+            temp_storage.save_knowledge_file(sample_project, sample_file, str(i)).name
+            for i in range(3)
+        ]
+
+        assert names == ["test.txt.text", "test.txt_1.text", "test.txt_2.text"]
+
+    def test_save_knowledge_file_overwrites_existing_path(self, temp_storage, sample_project, sample_file):
+        """Test that a recorded path is replaced in place instead of suffixed."""
+        temp_storage.save_project_metadata(sample_project)
+        first = temp_storage.save_knowledge_file(sample_project, sample_file, "v1")
+        existing_path = first.relative_to(temp_storage.get_project_path(sample_project)).as_posix()
+
+        second = temp_storage.save_knowledge_file(
+            sample_project, sample_file, "v2", existing_path=existing_path
+        )
+
+        assert second == first
+        assert second.read_text() == "v2"
+        assert [p.name for p in first.parent.iterdir()] == [first.name]
+
     def test_sanitize_name(self, temp_storage):
         """Test filename sanitization."""
         # Test various problematic characters
@@ -152,7 +191,35 @@ class TestLocalStorage:
         # Read it back
         state = temp_storage.get_sync_state()
         assert state == new_state
-    
+
+    def test_sync_state_round_trips_without_orjson(self, temp_storage):
+        """Test that the stdlib json fallback writes the same data."""
+        new_state = {"last_sync": None, "projects_synced": ["Ünïcode"], "total_files": 3}
+
+        with patch("claude_sync.sync.storage.orjson", None):
+            temp_storage.update_sync_state(new_state)
+            assert LocalStorage(temp_storage.base_path).get_sync_state() == new_state
+
+        # Files written by either backend read back identically
+        assert LocalStorage(temp_storage.base_path).get_sync_state() == new_state
+
+    def test_sync_state_cached_and_written_atomically(self, tmp_path):
+        """Test that the state is read once and a failed write keeps the old file."""
+        LocalStorage(tmp_path).update_sync_state({"total_files": 1})
+        storage = LocalStorage(tmp_path)
+
+        with patch("claude_sync.sync.storage._read_json", wraps=storage_module._read_json) as read_mock:
+            assert storage.get_sync_state() == {"total_files": 1}
+            assert storage.get_sync_state() == {"total_files": 1}
+        assert read_mock.call_count == 1
+
+        with patch("claude_sync.sync.storage.os.replace", side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                storage.update_sync_state({"total_files": 2})
+
+        assert LocalStorage(tmp_path).get_sync_state() == {"total_files": 1}
+        assert sorted(p.name for p in storage.metadata_dir.iterdir()) == ["sync_state.json"]
+
     def test_get_project_sync_status_not_synced(self, temp_storage, sample_project):
         """Test sync status for unsynced project."""
         status = temp_storage.get_project_sync_status(sample_project)
@@ -188,4 +255,15 @@ class TestLocalStorage:
         
         assert len(synced) == 3
         assert all("local_path" in p for p in synced)
-        assert sorted([p["name"] for p in synced]) == ["Project 0", "Project 1", "Project 2"]
\ No newline at end of file
+        assert sorted([p["name"] for p in synced]) == ["Project 0", "Project 1", "Project 2"]
+
+    def test_list_synced_projects_skips_stray_entries(self, temp_storage, sample_project):
+        """Test that files and directories without project.json are ignored."""
+        temp_storage.save_project_metadata(sample_project)
+        (temp_storage.projects_dir / "notes.txt").write_text("not a project")
+        (temp_storage.projects_dir / "empty").mkdir()
+
+        synced = temp_storage.list_synced_projects()
+
+        assert [p["name"] for p in synced] == ["Test Project"]
+        assert synced[0]["local_path"] == str(temp_storage.get_project_path(sample_project))